@@ -1,7 +1,519 @@
-import matplotlib.pyplot as plt
+import importlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import comb
+
 import numpy as np
-from sympy import *
-from sympy.abc import _clash1
+from numpy.polynomial import polynomial as P
+
+
+class _Lazy(object):
+    """
+    module that is imported on first attribute access
+    """
+
+    def __init__(self, name: str) -> None:
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr: str):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attr)
+
+
+# sympy and matplotlib take most of the import time, numeric beams without plots
+# never load them
+sympy = _Lazy("sympy")
+abc = _Lazy("sympy.abc")
+figure = _Lazy("matplotlib.figure")
+
+QUANTITIES = ("N", "w", "V", "Mz", "Mx", "sigma", "tau_y", "tau_xy")
+
+
+@lru_cache(maxsize=512)
+def _parse(s: str):
+    """
+    return the simplified expression of a load string, plain numbers are returned as
+    int or float so numeric beams with constant loads never import sympy
+    """
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    try:
+        if np.isfinite(float(s)):
+            return float(s)
+    except ValueError:
+        pass
+    return sympy.simplify(s, locals=abc._clash1)
+
+
+def _singularity(x, a, n):
+    """
+    vectorized <x - a>^n, impulses (n < 0) are not plotted and evaluate to 0
+    """
+    x = np.asarray(x, dtype=float)
+    if n < 0:
+        return np.zeros_like(x)
+    return np.where(x >= a, (x - a) ** n, 0.0)
+
+
+def _numpy_expr(expr):
+    """
+    return expr ready for lambdify, with SingularityFunction as singularity()
+
+    a coefficient of x times <x - a>^n is only evaluated right of a, left of it
+    the coefficient may be nan (sqrt(x - a), log(x - a)) and nan * 0 is nan.
+    """
+    x = sympy.symbols("x")
+    SF = sympy.SingularityFunction
+
+    def masked(term):
+        sf = [i for i in term.args if isinstance(i, SF)]
+        if not sf:
+            # c(x) * (<x - x1>^0 - <x - x2>^0)
+            terms = sympy.Add.make_args(sympy.expand_mul(term))
+            return sympy.Add(*(masked(i) if i.is_Mul else i for i in terms))
+        if len(sf) != 1 or sf[0].args[2] < 0:
+            return term
+        coeff = sympy.Mul(*(i for i in term.args if i is not sf[0]))
+        if not coeff.has(x):
+            return term
+        _, a, n = sf[0].args
+        return sympy.Piecewise((coeff * (x - a) ** n, x >= a), (0, True))
+
+    expr = sympy.sympify(expr).replace(
+        lambda i: i.is_Mul and i.has(SF) and i.has(x), masked
+    )
+    return expr.replace(SF, sympy.Function("singularity"))
+
+
+@lru_cache(maxsize=1024)
+def _compile(expr):
+    """
+    return a vectorized numpy function of x for expr
+    """
+    f = sympy.lambdify(
+        sympy.symbols("x"),
+        _numpy_expr(expr),
+        modules=[{"singularity": _singularity}, "numpy"],
+    )
+
+    def evaluator(xs):
+        xs = np.asarray(xs, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ys = f(xs)
+        return np.broadcast_to(np.asarray(ys, dtype=float), xs.shape).copy()
+
+    return evaluator
+
+
+@lru_cache(maxsize=256)
+def _compile_many(exprs: tuple):
+    """
+    return one vectorized numpy function of x for all exprs, their common
+    subexpressions are computed once
+    """
+    f = sympy.lambdify(
+        sympy.symbols("x"),
+        [_numpy_expr(i) for i in exprs],
+        modules=[{"singularity": _singularity}, "numpy"],
+        cse=True,
+    )
+
+    def evaluator(xs):
+        xs = np.asarray(xs, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ys = f(xs)
+        return [
+            np.broadcast_to(np.asarray(i, dtype=float), xs.shape).copy() for i in ys
+        ]
+
+    return evaluator
+
+
+def _integrate(expr, x):
+    """
+    integrate a sum of SingularityFunction terms with respect to x
+
+    polynomial coefficients are integrated from the singularity point, integrate()
+    would return meijerg functions for them which numpy can not evaluate.
+    """
+    terms = {}
+    for term in sympy.Add.make_args(sympy.expand_mul(expr)):
+        coeff, sf = term.as_independent(sympy.SingularityFunction, as_Add=False)
+        terms[sf] = terms.get(sf, 0) + coeff
+
+    result = 0
+    for sf, coeff in terms.items():
+        if not isinstance(sf, sympy.SingularityFunction) or (
+            coeff.has(x) and sf.args[2] < 0
+        ):
+            result += sympy.integrate(coeff * sf, x)
+        elif not coeff.has(x):
+            _, a, n = sf.args
+            result += (
+                coeff
+                * sympy.SingularityFunction(x, a, n + 1)
+                / (n + 1 if n >= 0 else 1)
+            )
+        else:
+            _, a, n = sf.args
+            t = sympy.Dummy("t")
+            result += sympy.integrate(
+                coeff.subs(x, t) * (t - a) ** n, (t, a, x)
+            ) * sympy.SingularityFunction(x, a, 0)
+    return result
+
+
+@lru_cache(maxsize=1024)
+def _coefficients(expr) -> tuple:
+    """
+    return the ascending coefficients of the polynomial expr in x
+    """
+    if isinstance(expr, (int, float)):
+        return (float(expr),)
+    x = sympy.symbols("x")
+    if not expr.is_polynomial(x):
+        raise Exception(f"{expr} is not a polynomial in x")
+    return tuple(float(i) for i in reversed(sympy.Poly(expr, x).all_coeffs()))
+
+
+def _resultant(c, x1: float, x2: float) -> float:
+    """
+    return the resultant of the load c(x) on [x1, x2]
+    """
+    c = np.asarray(c, dtype=float)
+    if x1 == x2:
+        return _horner(c, x1)
+    c = np.concatenate([[0.0], c / np.arange(1, len(c) + 1)])
+    return _horner(c, x2) - _horner(c, x1)
+
+
+def _load_terms(c, x1: float, x2: float) -> list:
+    """
+    return c(x) on [x1, x2] as singularity terms (c, a, n)
+    """
+    if x1 == x2:
+        return [(c, x1, -1)]
+    return [(c, x1, 0), (-np.asarray(c), x2, 0)]
+
+
+def _number(v: float, digits: int = 12):
+    """
+    return v as a sympy Integer when it is integral, otherwise as a Float
+    """
+    v = float(f"{v:.{digits}g}")
+    return sympy.Integer(int(v)) if v.is_integer() else sympy.Float(v)
+
+
+def _horner(coeffs, x):
+    """
+    evaluate rows of ascending coefficients at x
+    """
+    y = coeffs[..., -1]
+    for i in range(coeffs.shape[-1] - 2, -1, -1):
+        y = y * x + coeffs[..., i]
+    return y
+
+
+def _critical_points(coeffs, a: float, b: float):
+    """
+    return the real roots of the derivative of the polynomial coeffs inside (a, b)
+    """
+    d = np.trim_zeros(P.polyder(np.asarray(coeffs, dtype=float)), "b")
+    if len(d) < 2:
+        return np.zeros(0)
+    r = P.polyroots(d)
+    r = r.real[np.abs(r.imag) <= 1e-9 * np.maximum(1.0, np.abs(r))]
+    return r[(r > a) & (r < b)]
+
+
+def _refine(f, xs, ys, tol: float, depth: int = 12):
+    """
+    bisect the intervals of xs until the chords are within tol of f at the midpoints
+    """
+    for _ in range(depth):
+        m = (xs[:-1] + xs[1:]) / 2
+        ym = np.broadcast_to(f(m), m.shape)
+        bad = np.flatnonzero(np.abs(ym - (ys[:-1] + ys[1:]) / 2) > tol)
+        if not len(bad):
+            break
+        xs = np.insert(xs, bad + 1, m[bad])
+        ys = np.insert(ys, bad + 1, ym[bad])
+    return xs, ys
+
+
+class _Piecewise(object):
+    """
+    piecewise polynomial of x with impulses at its breakpoints
+
+    coeffs[i] (ascending powers of x) holds on [breaks[i], breaks[i + 1]), breaks[0]
+    is -inf with a zero row. delta[i] and ddelta[i] are the weights of
+    <x - breaks[i]>^-1 and <x - breaks[i]>^-2.
+    """
+
+    def __init__(self, breaks, coeffs, delta=None, ddelta=None) -> None:
+        self.breaks = breaks
+        self.coeffs = coeffs
+        self.delta = np.zeros(len(breaks)) if delta is None else delta
+        self.ddelta = np.zeros(len(breaks)) if ddelta is None else ddelta
+
+    @classmethod
+    def from_terms(cls, terms: list):
+        """
+        build from singularity terms (c, a, n) meaning c(x) <x - a>^n, n in -2, -1, 0
+        """
+        breaks = np.concatenate([[-np.inf], np.unique([i[1] for i in terms])])
+        rows = np.zeros((len(breaks), max([len(i[0]) for i in terms] + [1])))
+        delta = np.zeros(len(breaks))
+        ddelta = np.zeros(len(breaks))
+        for c, a, n in terms:
+            i = np.searchsorted(breaks, a)
+            if n == 0:
+                rows[i, : len(c)] += c
+            elif n == -1:
+                delta[i] += _horner(np.asarray(c), a)
+            else:
+                # same as integrate(): c(0) <x - a>^-1 - c'(a) <x - a>^0
+                ddelta[i] += c[0]
+                if len(c) > 1:
+                    delta[i] -= _horner(np.arange(1, len(c)) * np.asarray(c)[1:], a)
+        return cls(breaks, np.cumsum(rows, axis=0), delta, ddelta)
+
+    def __call__(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        i = np.searchsorted(self.breaks, xs, side="right") - 1
+        return _horner(self.coeffs[i], xs)
+
+    def __lift(self, breaks, degree: int):
+        i = np.searchsorted(self.breaks, breaks, side="right") - 1
+        coeffs = np.zeros((len(breaks), degree))
+        coeffs[:, : self.coeffs.shape[1]] = self.coeffs[i]
+        delta = np.zeros(len(breaks))
+        ddelta = np.zeros(len(breaks))
+        j = np.searchsorted(breaks, self.breaks)
+        delta[j] = self.delta
+        ddelta[j] = self.ddelta
+        return coeffs, delta, ddelta
+
+    def __add__(self, other):
+        breaks = np.union1d(self.breaks, other.breaks)
+        degree = max(self.coeffs.shape[1], other.coeffs.shape[1])
+        a = self.__lift(breaks, degree)
+        b = other.__lift(breaks, degree)
+        return _Piecewise(breaks, a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+    def __mul__(self, k: float):
+        return _Piecewise(self.breaks, self.coeffs * k, self.delta * k, self.ddelta * k)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k: float):
+        return self * (1 / k)
+
+    def __neg__(self):
+        return self * -1
+
+    def __sub__(self, other):
+        return self + -other
+
+    def integrate(self):
+        """
+        return the antiderivative that vanishes left of the first breakpoint
+        """
+        coeffs = np.zeros((len(self.breaks), self.coeffs.shape[1] + 1))
+        coeffs[:, 1:] = self.coeffs / np.arange(1, self.coeffs.shape[1] + 1)
+        # keep continuity between segments, impulses add their jumps
+        b = self.breaks[1:]
+        jumps = _horner(coeffs[:-1], b) - _horner(coeffs[1:], b) + self.delta[1:]
+        coeffs[1:, 0] += np.cumsum(jumps)
+        return _Piecewise(self.breaks, coeffs, self.ddelta.copy())
+
+    def as_expr(self, x):
+        """
+        return the sympy expression in SingularityFunction terms
+        """
+        scale = 1e-12 * max(1.0, np.abs(self.coeffs).max())
+        # one Add at the end, adding term by term is quadratic in sympy
+        terms = []
+        for i in range(1, len(self.breaks)):
+            a = self.breaks[i]
+            diff = P.polysub(self.coeffs[i], self.coeffs[i - 1])
+            # Taylor coefficients about a give the <x - a>^n terms
+            diff = P.Polynomial(diff)(P.Polynomial([a, 1])).coef
+            for n, d in enumerate(diff):
+                if abs(d) > scale:
+                    terms.append(
+                        _number(d) * sympy.SingularityFunction(x, _number(a), n)
+                    )
+            for n, d in ((-1, self.delta[i]), (-2, self.ddelta[i])):
+                if abs(d) > scale:
+                    terms.append(
+                        _number(d) * sympy.SingularityFunction(x, _number(a), n)
+                    )
+        return sympy.Add(*terms)
+
+
+def _point_loads(positions, values) -> _Piecewise:
+    """
+    return point loads as impulses, coincident ones are summed
+    """
+    breaks, index = np.unique(positions, return_inverse=True)
+    delta = np.zeros(len(breaks) + 1)
+    delta[1:] = np.bincount(index, weights=values, minlength=len(breaks))
+    return _Piecewise(
+        np.concatenate([[-np.inf], breaks]), np.zeros((len(breaks) + 1, 1)), delta
+    )
+
+
+def _tabulated(xs, q) -> _Piecewise:
+    """
+    return the load q tabulated at xs, linear between the stations and zero outside
+    """
+    slope = np.diff(q) / np.diff(xs)
+    coeffs = np.zeros((len(xs) + 1, 2))
+    coeffs[1:-1, 0] = q[:-1] - slope * xs[:-1]
+    coeffs[1:-1, 1] = slope
+    return _Piecewise(np.concatenate([[-np.inf], xs]), coeffs)
+
+
+@lru_cache(maxsize=256)
+def _quadrature(expr, x1: float, x2: float, pieces: int = 16, degree: int = 7):
+    """
+    return the interpolant of expr on [x1, x2] at Gauss-Legendre nodes, one polynomial
+    of degree per piece, with the nodes and weights of the whole span
+
+    integrating the interpolant is the same as the Gauss-Legendre rule on its nodes.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(degree + 1)
+    h = (x2 - x1) / pieces
+    a = x1 + h * np.arange(pieces)
+    t = (nodes + 1) * h / 2
+    xs = a[None, :] + t[:, None]
+    # one call for all the nodes
+    ys = _compile(expr)(xs)
+    # ascending coefficients of x - a[j], one row per piece
+    local = P.polyfit(t, ys, degree).T
+    return local, xs.T.ravel(), np.tile(weights * h / 2, pieces), ys.T.ravel()
+
+
+def _pieces_piecewise(local, x1: float, x2: float) -> _Piecewise:
+    """
+    return the pieces of _quadrature as a _Piecewise
+    """
+    pieces, degree = local.shape
+    a = x1 + (x2 - x1) / pieces * np.arange(pieces)
+    coeffs = np.zeros((pieces + 2, degree))
+    for j in range(pieces):
+        c = P.Polynomial(local[j])(P.Polynomial([-a[j], 1.0])).coef
+        coeffs[j + 1, : len(c)] = c
+    return _Piecewise(np.concatenate([[-np.inf], a, [x2]]), coeffs)
+
+
+def _pieces_terms(local, x1: float, x2: float) -> list:
+    """
+    return the pieces of _quadrature as singularity terms (c, a, n) with constant c
+
+    every piece starts with its own coefficients and is cancelled at its end by its
+    Taylor coefficients there, the global power basis would cancel catastrophically.
+    """
+    pieces = len(local)
+    h = (x2 - x1) / pieces
+    terms = []
+    for j in range(pieces):
+        a = x1 + h * j
+        end = P.Polynomial(local[j])(P.Polynomial([h, 1.0])).coef
+        terms += [(c, a, n) for n, c in enumerate(local[j])]
+        terms += [(-c, a + h, n) for n, c in enumerate(end)]
+    return terms
+
+
+def _terms_expr(terms: list, x, k: int = 0):
+    """
+    return the sum of the singularity terms (c, a, n) integrated k times
+    """
+    expr = []
+    for c, a, n in terms:
+        for _ in range(k):
+            c, n = (c / (n + 1) if n >= 0 else c), n + 1
+        # full precision, high powers amplify any rounding
+        if c:
+            expr.append(
+                _number(c, 17) * sympy.SingularityFunction(x, _number(a, 17), n)
+            )
+    return sympy.Add(*expr)
+
+
+# (expr, timeout): whether sympy integrated expr within timeout seconds
+_searches = {}
+
+
+def _search(expr, conn) -> None:
+    # runs in its own process, so it can be stopped
+    x = sympy.symbols("x")
+    first = sympy.integrate(expr, x)
+    second = sympy.integrate(first, x)
+    moment = sympy.integrate(x * expr, x)
+    conn.send(not any(i.has(sympy.Integral) for i in (first, second, moment)))
+
+
+def _integrable(exprs: tuple, timeout: float) -> list:
+    """
+    whether sympy finds the antiderivatives each load needs within timeout seconds
+
+    the searches run at the same time, one process each, and are stopped at the
+    deadline. The answers are remembered.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["sympy"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    jobs = {}
+    for expr in set(exprs):
+        if (expr, timeout) in _searches:
+            continue
+        conn, child = context.Pipe(duplex=False)
+        process = context.Process(target=_search, args=(expr, child), daemon=True)
+        process.start()
+        child.close()
+        jobs[expr] = (process, conn)
+
+    deadline = time.monotonic() + timeout
+    if len(_searches) + len(jobs) > 1024:
+        _searches.clear()
+    for expr, (process, conn) in jobs.items():
+        try:
+            found = conn.poll(max(0.0, deadline - time.monotonic())) and conn.recv()
+        except EOFError:
+            # the search failed
+            found = False
+        process.terminate()
+        process.join()
+        conn.close()
+        _searches[expr, timeout] = bool(found)
+    return [_searches.get((i, timeout), False) for i in exprs]
+
+
+def integrable(loads: list, timeout: float = 2.0) -> list:
+    """
+    return whether sympy integrates each load string within timeout seconds
+
+    the answers are remembered for Beam(..., integration="auto"), so a server can
+    search them before it takes a lock.
+    """
+    x = sympy.symbols("x")
+    exprs = [_parse(str(i)) for i in loads]
+    hard = tuple(
+        i for i in exprs if not isinstance(i, (int, float)) and not i.is_polynomial(x)
+    )
+    found = dict(zip(hard, _integrable(hard, timeout)))
+    return [found.get(i, True) for i in exprs]
 
 
 class Beam(object):
@@ -14,6 +526,10 @@ class Beam(object):
         WT: float,
         xpin: float = 0.0,
         xroller: float | None = None,
+        engine: str = "symbolic",
+        piecewise: bool = False,
+        integration: str = "symbolic",
+        timeout: float = 2.0,
     ) -> None:
         """
         Analysis of pin-roller and cantilever beams.
@@ -22,9 +538,20 @@ class Beam(object):
             lenght, F, W, FT, FW are the geometric sections of the beam.
 
             If xroller is None, the beam is a cantilever, otherwise use xpin and xroller to specify pin and roller coordinates.
+
+            engine is "symbolic" (SymPy) or "numeric" (NumPy, polynomial loads only).
+
+            piecewise writes the diagrams as one polynomial per segment instead of singularity functions.
+
+            integration is how distributed forces that are not polynomials are integrated, "symbolic" (SymPy),
+            "numeric" (Gauss-Legendre) or "auto", symbolic unless SymPy takes more than timeout seconds.
         """
         if xpin == xroller:
             raise Exception("xpin and xroller are the same!")
+        if engine not in ("symbolic", "numeric"):
+            raise Exception("engine is symbolic or numeric")
+        if integration not in ("symbolic", "numeric", "auto"):
+            raise Exception("integration is symbolic, numeric or auto")
         self.__lenght = lenght
         self.__F = F
         self.__W = W
@@ -32,6 +559,10 @@ class Beam(object):
         self.__WT = WT
         self.__xpin = xpin
         self.__xroller = xroller
+        self.__engine = engine
+        self.__piecewise = piecewise
+        self.__integration = integration
+        self.__timeout = timeout
 
         self.__Area = W * WT + F * FT
         self.__C1W = 1 / 3 * (1 - 0.63 * W / WT)
@@ -55,8 +586,14 @@ class Beam(object):
 
         self.__floads = []
         self.__mloads = []
+        self.__arrays = []
+        self.__totals = {}
 
-        self.__x = symbols("x")
+        self.__x = sympy.symbols("x") if engine == "symbolic" else None
+        self.__solved = False
+        self.__results = {}
+        self.__evaluators = {}
+        self.__polynomials = {}
 
     def floading(self, x: str, y: str, x1: float, x2: float | None = None) -> None:
         """
@@ -70,14 +607,16 @@ class Beam(object):
             raise Exception("x1 <= x2")
         elif x2 > self.__lenght:
             raise Exception("x2 <= lenght")
-        self.__floads.append(
-            {
-                "x": simplify(x, locals=_clash1),
-                "y": simplify(y, locals=_clash1),
-                "x1": x1,
-                "x2": x2,
-            }
-        )
+        load = {
+            "x": _parse(str(x)),
+            "y": _parse(str(y)),
+            "x1": x1,
+            "x2": x2,
+            "shares": {},
+        }
+        load["numeric"] = self.__numeric(load)
+        self.__floads.append(load)
+        self.__add(load, self.__fshare)
 
     def mloading(self, x: str, z: str, x1: float, x2: float | None = None) -> None:
         """
@@ -91,164 +630,505 @@ class Beam(object):
             raise Exception("x1 <= x2")
         elif x2 > self.__lenght:
             raise Exception("x2 <= lenght")
-        self.__mloads.append(
-            {
-                "x": simplify(x, locals=_clash1),
-                "z": simplify(z, locals=_clash1),
-                "x1": x1,
-                "x2": x2,
-            }
-        )
+        load = {
+            "x": _parse(str(x)),
+            "z": _parse(str(z)),
+            "x1": x1,
+            "x2": x2,
+            "shares": {},
+        }
+        self.__mloads.append(load)
+        self.__add(load, self.__mshare)
 
-    def __statical_analysis(self) -> None:
-        # Solve for reactions
-        self.__Nx = -sum(
-            [
-                i["x"]
-                if i["x1"] == i["x2"]
-                else integrate(i["x"], (self.__x, i["x1"], i["x2"]))
-                for i in self.__floads
-            ]
-        )
-        self.__Ny = -sum(
-            [
-                i["y"]
-                if i["x1"] == i["x2"]
-                else integrate(i["y"], (self.__x, i["x1"], i["x2"]))
-                for i in self.__floads
-            ]
+    def add_point_loads(self, positions, fx, fy) -> None:
+        """
+        F = Fx î + Fy ĵ at every one of positions, given as arrays
+
+        the loads are kept as arrays and summed numerically, so thousands of them cost
+        about as much as one with either engine; only the latex writes them out as
+        singularity terms.
+        """
+        positions = np.asarray(positions, dtype=float)
+        fx, fy = np.broadcast_arrays(
+            np.asarray(fx, dtype=float), np.asarray(fy, dtype=float), positions
+        )[:2]
+        if np.any(positions < 0) or np.any(positions > self.__lenght):
+            raise Exception("0 <= positions <= lenght")
+        self.__arrays.append(
+            {"positions": positions.ravel(), "x": fx.ravel(), "y": fy.ravel()}
         )
-        self.__MzN = -sum(
-            [
-                (i["x1"] - self.__xpin) * i["y"]
-                if i["x1"] == i["x2"]
-                else integrate(
-                    (self.__x - self.__xpin) * i["y"], (self.__x, i["x1"], i["x2"])
+        self.__retotal()
+
+    def add_tabulated_load(self, xs, q) -> None:
+        """
+        Fy(x) ĵ tabulated at the increasing stations xs, linear between them
+        """
+        xs = np.asarray(xs, dtype=float)
+        q = np.asarray(q, dtype=float)
+        if xs.shape != q.shape or xs.ndim != 1 or len(xs) < 2:
+            raise Exception("xs and q are 1D arrays of the same length")
+        elif np.any(np.diff(xs) <= 0):
+            raise Exception("xs must be increasing")
+        elif xs[0] < 0 or xs[-1] > self.__lenght:
+            raise Exception("0 <= xs <= lenght")
+        self.__arrays.append({"xs": xs, "y": q})
+        self.__retotal()
+
+    def __bulk(self, terms: bool = False) -> dict:
+        """
+        return the reactions and the N and w loadings of the array loads
+
+        the loadings are _Piecewise, or singularity terms (c, a, n) if terms.
+        """
+        positions = [i["positions"] for i in self.__arrays if "positions" in i]
+        fx = np.concatenate([[]] + [i["x"] for i in self.__arrays if "positions" in i])
+        fy = np.concatenate([[]] + [i["y"] for i in self.__arrays if "positions" in i])
+        positions = np.concatenate([[]] + positions)
+        # point loads, tables and quadrature all end up as piecewise polynomials
+        bulk = {
+            "Nx": -fx.sum(),
+            "Ny": -fy.sum(),
+            "MzN": -((positions - self.__xpin) * fy).sum(),
+            "N": _point_loads(positions, fx),
+            "w": _point_loads(positions, -fy),
+        }
+        if terms:
+            bulk["N"] = [(c, a, -1) for c, a in zip(fx, positions)]
+            bulk["w"] = [(-c, a, -1) for c, a in zip(fy, positions)]
+        for i in self.__arrays:
+            if "xs" not in i:
+                continue
+            a, b = i["xs"][:-1] - self.__xpin, i["xs"][1:] - self.__xpin
+            qa, qb = i["y"][:-1], i["y"][1:]
+            # exact for loads linear between the stations
+            bulk["Ny"] -= ((b - a) * (qa + qb) / 2).sum()
+            bulk["MzN"] -= ((b - a) * (a * (2 * qa + qb) + b * (qa + 2 * qb)) / 6).sum()
+            if not terms:
+                bulk["w"] = bulk["w"] - _tabulated(i["xs"], i["y"])
+                continue
+            slope = np.diff(i["y"]) / np.diff(i["xs"])
+            for x1, x2, q1, q2, m in zip(
+                i["xs"][:-1], i["xs"][1:], i["y"][:-1], i["y"][1:], slope
+            ):
+                bulk["w"] += [(-q1, x1, 0), (-m, x1, 1), (q2, x2, 0), (m, x2, 1)]
+        for i in self.__floads:
+            if not i["numeric"]:
+                continue
+            fx, xs, ws, qx = _quadrature(i["x"], i["x1"], i["x2"])
+            fy, xs, ws, qy = _quadrature(i["y"], i["x1"], i["x2"])
+            bulk["Nx"] -= ws @ qx
+            bulk["Ny"] -= ws @ qy
+            bulk["MzN"] -= ws @ ((xs - self.__xpin) * qy)
+            if terms:
+                bulk["N"] += _pieces_terms(fx, i["x1"], i["x2"])
+                bulk["w"] += [
+                    (-c, a, n) for c, a, n in _pieces_terms(fy, i["x1"], i["x2"])
+                ]
+            else:
+                bulk["N"] = bulk["N"] + _pieces_piecewise(fx, i["x1"], i["x2"])
+                bulk["w"] = bulk["w"] - _pieces_piecewise(fy, i["x1"], i["x2"])
+        return bulk
+
+    def __has_bulk(self) -> bool:
+        return bool(self.__arrays) or any(i["numeric"] for i in self.__floads)
+
+    def __bulk_share(self, key: str):
+        # share of the array loads in one reaction, or in a diagram for the latex
+        if not self.__has_bulk():
+            return sympy.Integer(0)
+        bulk = self.__bulk(terms=True)
+        if key in ("Nx", "Ny", "MzN"):
+            return _number(bulk[key], 17)
+        if key == "N":
+            return -_terms_expr(bulk["N"], self.__x, 1)
+        elif key == "w":
+            return _terms_expr(bulk["w"], self.__x)
+        elif key == "V":
+            return -_terms_expr(bulk["w"], self.__x, 1)
+        elif key == "Mz":
+            return -_terms_expr(bulk["w"], self.__x, 2)
+        elif key == "sigma":
+            return (
+                self.__bulk_share("N") / self.__Area
+                - self.__bulk_share("Mz") * self.__ymax / self.__Izz
+            )
+        elif key == "tau_xy":
+            return (
+                self.__bulk_share("V")
+                * self.__WT
+                * self.__ybar**2
+                / 2
+                / self.__Iyy
+                / self.__WT
+            )
+        return sympy.Integer(0)
+
+    def __bulk_diagram(self, name: str):
+        """
+        return the share of the array loads in a diagram as a _Piecewise, None if
+        they have none
+
+        the symbolic engine keeps them out of its expressions and adds these values.
+        """
+        if (
+            name not in ("N", "w", "V", "Mz", "sigma", "tau_xy")
+            or not self.__has_bulk()
+        ):
+            return None
+        key = ("bulk", name)
+        if key not in self.__evaluators:
+            if name in ("N", "w"):
+                bulk = self.__bulk()
+                diagram = -bulk["N"].integrate() if name == "N" else bulk["w"]
+            elif name == "V":
+                diagram = -self.__bulk_diagram("w").integrate()
+            elif name == "Mz":
+                diagram = self.__bulk_diagram("V").integrate()
+            elif name == "sigma":
+                diagram = (
+                    self.__bulk_diagram("N") / self.__Area
+                    - self.__bulk_diagram("Mz") * self.__ymax / self.__Izz
                 )
-                for i in self.__floads
-            ]
-        ) - sum(
-            [
-                i["z"]
-                if i["x1"] == i["x2"]
-                else integrate(i["z"], (self.__x, i["x1"], i["x2"]))
-                for i in self.__mloads
-            ]
+            else:
+                diagram = (
+                    self.__bulk_diagram("V")
+                    * self.__WT
+                    * self.__ybar**2
+                    / 2
+                    / self.__Iyy
+                    / self.__WT
+                )
+            self.__evaluators[key] = diagram
+        return self.__evaluators[key]
+
+    def remove_floading(self, index: int) -> None:
+        """
+        remove the index-th force loading
+        """
+        self.__floads.pop(index)
+        self.__retotal()
+
+    def remove_mloading(self, index: int) -> None:
+        """
+        remove the index-th moment loading
+        """
+        self.__mloads.pop(index)
+        self.__retotal()
+
+    def __numeric(self, load: dict) -> bool:
+        """
+        whether a distributed force is integrated by quadrature
+        """
+        if self.__integration == "symbolic" or load["x1"] == load["x2"]:
+            return False
+        hard = tuple(
+            i
+            for i in (load["x"], load["y"])
+            if not isinstance(i, (int, float))
+            and not i.is_polynomial(sympy.symbols("x"))
         )
-        self.__MxN = -sum(
-            i["x"]
-            if i["x1"] == i["x2"]
-            else integrate(i["x"], (self.__x, i["x1"], i["x2"]))
+        if not hard:
+            return False
+        if self.__integration == "numeric" or self.__engine == "numeric":
+            return True
+        return not all(_integrable(hard, self.__timeout))
+
+    def __add(self, load: dict, share) -> None:
+        # only the totals asked for so far are kept up to date
+        self.__changed()
+        if self.__engine == "numeric":
+            return
+        if load.get("numeric"):
+            # summed with the array loads
+            self.__totals = {}
+            return
+        for k in self.__totals:
+            self.__totals[k] += share(load, k)
+
+    def __retotal(self) -> None:
+        # sum again instead of subtracting, so no round-off is left behind
+        self.__changed()
+        self.__totals = {}
+
+    def __changed(self) -> None:
+        self.__solved = False
+        self.__results = {}
+        self.__evaluators = {}
+        self.__polynomials = {}
+
+    def __total(self, key: str):
+        """
+        return the sum of the loads' shares in key
+        """
+        if key not in self.__totals:
+            self.__totals[key] = sympy.Add(
+                *(self.__fshare(i, key) for i in self.__floads),
+                *(self.__mshare(i, key) for i in self.__mloads),
+                # their diagrams are added as _Piecewise, see __bulk_diagram
+                self.__bulk_share(key) if key in ("Nx", "Ny", "MzN") else 0,
+            )
+        return self.__totals[key]
+
+    def __shape(self, load: dict):
+        """
+        <x - x1>^-1 for point loading, <x - x1>^0 - <x - x2>^0 otherwise
+        """
+        SF = sympy.SingularityFunction
+        if load["x1"] == load["x2"]:
+            return SF(self.__x, load["x1"], -1)
+        return SF(self.__x, load["x1"], 0) - SF(self.__x, load["x2"], 0)
+
+    def __resultant(self, expr, load: dict):
+        if load["x1"] == load["x2"]:
+            return expr
+        return sympy.integrate(expr, (self.__x, load["x1"], load["x2"]))
+
+    def __fshare(self, i: dict, key: str):
+        # share of a force loading in one reaction or diagram, kept on the load
+        if key in i["shares"]:
+            return i["shares"][key]
+        x = self.__x
+        if i["numeric"]:
+            # in __bulk_share
+            share = sympy.Integer(0)
+        elif key == "Nx":
+            share = -self.__resultant(i["x"], i)
+        elif key == "Ny":
+            share = -self.__resultant(i["y"], i)
+        elif key == "MzN":
+            if i["x1"] == i["x2"]:
+                share = -(i["x1"] - self.__xpin) * i["y"]
+            else:
+                share = -self.__resultant((x - self.__xpin) * i["y"], i)
+        elif key == "N":
+            share = -_integrate(i["x"] * self.__shape(i), x)
+        elif key == "w":
+            share = -i["y"] * self.__shape(i)
+        elif key == "V":
+            share = -_integrate(self.__fshare(i, "w"), x)
+        elif key == "Mz":
+            share = _integrate(self.__fshare(i, "V"), x)
+        else:
+            share = sympy.Integer(0)
+        i["shares"][key] = share
+        return share
+
+    def __mshare(self, i: dict, key: str):
+        # share of a moment loading in one reaction or diagram, kept on the load
+        if key in i["shares"]:
+            return i["shares"][key]
+        x = self.__x
+        if key == "MzN":
+            share = -self.__resultant(i["z"], i)
+        elif key == "MxN":
+            share = -self.__resultant(i["x"], i)
+        elif key == "w":
+            share = i["z"] * sympy.SingularityFunction(x, i["x1"], -2)
+        elif key == "V":
+            share = -_integrate(self.__mshare(i, "w"), x)
+        elif key == "Mz":
+            share = _integrate(
+                self.__mshare(i, "V")
+                - i["z"]
+                * (
+                    sympy.SingularityFunction(x, i["x1"], 0)
+                    - sympy.SingularityFunction(x, i["x2"], 0)
+                ),
+                x,
+            )
+        elif key == "Mx":
+            share = -_integrate(i["x"] * self.__shape(i), x)
+        else:
+            share = sympy.Integer(0)
+        i["shares"][key] = share
+        return share
+
+    def __statical_analysis(self, name: str):
+        # Solve for reactions
+        if name in ("Nx", "Ny", "MzN", "MxN"):
+            return self.__total(name)
+        if self.__xroller is None:
+            raise Exception(f"{name} is a pin-roller reaction")
+        Ny2 = self.__total("MzN") / (self.__xroller - self.__xpin)
+        if name == "Ny2":
+            return Ny2
+        return self.__total("Ny") - Ny2
+
+    def __Mechanical_analaysis(self, name: str):
+        # the loads are summed in __totals, only the supports are left
+        x = self.__x
+        SF = sympy.SingularityFunction
+        if name == "N":
+            return self.__total("N") - self.__result("Nx") * SF(x, self.__xpin, 0)
+        if name in ("w", "V", "Mz"):
+            supports = (
+                -self.__result("Ny") * SF(x, self.__xpin, -1)
+                + self.__result("MzN") * SF(x, self.__xpin, -2)
+                if self.__xroller is None
+                else -self.__result("Ny1") * SF(x, self.__xpin, -1)
+                - self.__result("Ny2") * SF(x, self.__xroller, -1)
+            )
+            if name == "w":
+                return self.__total("w") + supports
+            # shear force
+            v = -_integrate(supports, x)
+            if name == "V":
+                return self.__total("V") + v
+            # bending moment
+            return self.__total("Mz") + _integrate(v, x)
+        if name == "Mx":
+            # torque
+            return self.__total("Mx") - self.__result("MxN") * SF(x, self.__xpin, 0)
+        if name == "tau_y":
+            return self.__result("Mx") * (
+                1 / self.__C1W / self.__WT / self.__W**2
+                + 1 / self.__C1F / self.__FT / self.__F**2
+            )
+        if name == "sigma":
+            return (
+                self.__result("N") / self.__Area
+                - self.__result("Mz") * self.__ymax / self.__Izz
+            )
+        if name == "tau_xy":
+            return (
+                self.__result("V")
+                * self.__WT
+                * self.__ybar**2
+                / 2
+                / self.__Iyy
+                / self.__WT
+            )
+        return self.__statical_analysis(name)
+
+    def __numeric_analysis(self) -> None:
+        # same model as the symbolic path with the loads as numpy polynomials
+        floads = [
+            (_coefficients(i["x"]), _coefficients(i["y"]), i["x1"], i["x2"])
+            for i in self.__floads
+            if not i["numeric"]
+        ]
+        mloads = [
+            (_coefficients(i["x"]), _coefficients(i["z"]), i["x1"], i["x2"])
             for i in self.__mloads
+        ]
+        arm = (-self.__xpin, 1.0)
+        bulk = self.__bulk()
+
+        Nx = bulk["Nx"] - sum(_resultant(fx, x1, x2) for fx, _, x1, x2 in floads)
+        Ny = bulk["Ny"] - sum(_resultant(fy, x1, x2) for _, fy, x1, x2 in floads)
+        MzN = (
+            bulk["MzN"]
+            - sum(_resultant(P.polymul(arm, fy), x1, x2) for _, fy, x1, x2 in floads)
+            - sum(_resultant(mz, x1, x2) for _, mz, x1, x2 in mloads)
         )
+        MxN = -sum(_resultant(mx, x1, x2) for mx, _, x1, x2 in mloads)
+        self.__results = {"Nx": Nx, "Ny": Ny, "MzN": MzN, "MxN": MxN}
         if self.__xroller is not None:
-            self.__Ny2 = self.__MzN / (self.__xroller - self.__xpin)
-            self.__Ny1 = self.__Ny - self.__Ny2
+            Ny2 = MzN / (self.__xroller - self.__xpin)
+            Ny1 = Ny - Ny2
+            self.__results.update(Ny1=Ny1, Ny2=Ny2)
+        # plain floats without negative zeros, empty sums are the int 0
+        self.__results = {k: float(v) + 0.0 for k, v in self.__results.items()}
 
-    def __Mechanical_analaysis(self) -> None:
-        # fxw
-        self.__fxw = -integrate(
-            sum(
-                [self.__Nx * SingularityFunction(self.__x, self.__xpin, -1)]
-                + [
-                    i["x"] * SingularityFunction(self.__x, i["x1"], -1)
-                    if i["x1"] == i["x2"]
-                    else i["x"]
-                    * (
-                        SingularityFunction(self.__x, i["x1"], 0)
-                        - SingularityFunction(self.__x, i["x2"], 0)
-                    )
-                    for i in self.__floads
-                ]
-            ),
-            self.__x,
-        )
-        # fyw
-        self.__fyw = sum(
+        fxw = -(
+            _Piecewise.from_terms(
+                [((Nx,), self.__xpin, -1)]
+                + [t for fx, _, x1, x2 in floads for t in _load_terms(fx, x1, x2)]
+            )
+            + bulk["N"]
+        ).integrate()
+        fyw = bulk["w"] + _Piecewise.from_terms(
             [
-                -i["y"] * SingularityFunction(self.__x, i["x1"], -1)
-                if i["x1"] == i["x2"]
-                else -i["y"]
-                * (
-                    SingularityFunction(self.__x, i["x1"], 0)
-                    - SingularityFunction(self.__x, i["x2"], 0)
-                )
-                for i in self.__floads
-            ]
-            + [
-                i["z"] * SingularityFunction(self.__x, i["x1"], -2)
-                # if i["x1"] == i["x2"]
-                # else i["z"]
-                # * (
-                #     SingularityFunction(self.__x, i["x1"], -1)
-                #     - SingularityFunction(self.__x, i["x2"], -1)
-                # )
-                for i in self.__mloads
+                t
+                for _, fy, x1, x2 in floads
+                for t in _load_terms(-np.asarray(fy), x1, x2)
             ]
+            + [(mz, x1, -2) for _, mz, x1, _ in mloads]
             + (
-                [
-                    -self.__Ny * SingularityFunction(self.__x, self.__xpin, -1),
-                    self.__MzN * SingularityFunction(self.__x, self.__xpin, -2),
-                ]
+                [((-Ny,), self.__xpin, -1), ((MzN,), self.__xpin, -2)]
                 if self.__xroller is None
                 else [
-                    -self.__Ny1 * SingularityFunction(self.__x, self.__xpin, -1),
-                    -self.__Ny2 * SingularityFunction(self.__x, self.__xroller, -1),
+                    ((-Ny1,), self.__xpin, -1),
+                    ((-Ny2,), self.__xroller, -1),
                 ]
             )
         )
-        # shear force
-        self.__v = -integrate(self.__fyw, self.__x)
-        # bending moment
-        self.__Mz = integrate(
-            self.__v
-            - sum(
-                [
-                    i["z"]
-                    * (
-                        SingularityFunction(self.__x, i["x1"], 0)
-                        - SingularityFunction(self.__x, i["x2"], 0)
-                    )
-                    for i in self.__mloads
-                ]
-            ),
-            self.__x,
-        )
-        # torque
-        self.__Mx = -integrate(
-            sum(
-                [self.__MxN * SingularityFunction(self.__x, self.__xpin, -1)]
-                + [
-                    i["x"] * SingularityFunction(self.__x, i["x1"], -1)
-                    if i["x1"] == i["x2"]
-                    else i["x"]
-                    * (
-                        SingularityFunction(self.__x, i["x1"], 0)
-                        - SingularityFunction(self.__x, i["x2"], 0)
-                    )
-                    for i in self.__mloads
-                ]
+        v = -fyw.integrate()
+        Mz = (
+            v
+            - _Piecewise.from_terms(
+                [(mz, x1, 0) for _, mz, x1, _ in mloads]
+                + [(-np.asarray(mz), x2, 0) for _, mz, _, x2 in mloads]
+            )
+        ).integrate()
+        Mx = -_Piecewise.from_terms(
+            [((MxN,), self.__xpin, -1)]
+            + [t for mx, _, x1, x2 in mloads for t in _load_terms(mx, x1, x2)]
+        ).integrate()
+        self.__evaluators = {
+            "N": fxw,
+            "w": fyw,
+            "V": v,
+            "Mz": Mz,
+            "Mx": Mx,
+            "sigma": fxw / self.__Area - Mz * self.__ymax / self.__Izz,
+            "tau_y": Mx
+            * (
+                1 / self.__C1W / self.__WT / self.__W**2
+                + 1 / self.__C1F / self.__FT / self.__F**2
             ),
-            self.__x,
-        )
-        # tau_y_max stress
-        self.__tauy = self.__Mx * (
-            1 / self.__C1W / self.__WT / self.__W**2
-            + 1 / self.__C1F / self.__FT / self.__F**2
-        )
-        # normal stress
-        self.__sigma = self.__fxw / self.__Area - self.__Mz * self.__ymax / self.__Izz
-        # tau_xy_max stress
-        self.__tauxy = (
-            self.__v * self.__WT * self.__ybar**2 / 2 / self.__Iyy / self.__WT
-        )
+            "tau_xy": v * self.__WT * self.__ybar**2 / 2 / self.__Iyy / self.__WT,
+        }
+
+    def __result(self, name: str):
+        """
+        return a reaction or a diagram, computed the first time it is asked for
+        """
+        if not self.__solved:
+            raise Exception("calculate() the beam first")
+        if name not in self.__results:
+            if self.__engine == "numeric":
+                self.__results[name] = self.__evaluators[name].as_expr(
+                    sympy.symbols("x")
+                )
+            else:
+                self.__results[name] = self.__Mechanical_analaysis(name)
+        return self.__results[name]
+
+    def __evaluator(self, name: str):
+        if name not in self.__evaluators:
+            self.__evaluators[name] = _compile(self.__output(name))
+        return self.__evaluators[name]
+
+    def __output(self, name: str):
+        """
+        return a diagram in the form asked for in __init__
+        """
+        if not self.__piecewise:
+            if self.__engine == "numeric" or not self.__has_bulk():
+                return self.__result(name)
+            # the array loads are only written out as singularity terms here
+            key = ("singularity", name)
+            if key not in self.__results:
+                self.__results[key] = self.__result(name) + self.__bulk_share(name)
+            return self.__results[key]
+        key = ("piecewise", name)
+        if key not in self.__results:
+            x = sympy.symbols("x")
+            rows = self.segments(name)
+            self.__results[key] = sympy.Piecewise(
+                *[(p, x < b) for _, b, p in rows[:-1]], (rows[-1][2], True)
+            )
+        return self.__results[key]
 
     def loadings(self):
         """
         return all loading entries in plot
         """
-        fig1, ax1 = plt.subplots(2, 1)
-        fig2, ax2 = plt.subplots(2, 1)
+        fig1 = figure.Figure()
+        ax1 = fig1.subplots(2, 1)
+        fig2 = figure.Figure()
+        ax2 = fig2.subplots(2, 1)
 
         ax1[0].set(title="Moment Loadings", ylabel=r"$M_{x}$")
         ax1[1].set(xlabel=r"$x$", ylabel=r"$M_{z}$")
@@ -261,14 +1141,20 @@ class Beam(object):
             else:
                 ax1[0].plot(
                     np.linspace(i["x1"], i["x2"]),
-                    [i["x"].subs(self.__x, j) for j in np.linspace(i["x1"], i["x2"])],
+                    _compile(i["x"])(np.linspace(i["x1"], i["x2"])),
                     color="red",
                 )
                 ax1[1].plot(
                     np.linspace(i["x1"], i["x2"]),
-                    [i["z"].subs(self.__x, j) for j in np.linspace(i["x1"], i["x2"])],
+                    _compile(i["z"])(np.linspace(i["x1"], i["x2"])),
                     color="orange",
                 )
+        for i in self.__arrays:
+            if "positions" in i:
+                ax2[0].vlines(i["positions"], 0, i["x"], color="blue")
+                ax2[1].vlines(i["positions"], 0, i["y"], color="green")
+            else:
+                ax2[1].plot(i["xs"], i["y"], color="green")
         for i in self.__floads:
             if i["x1"] == i["x2"]:
                 ax2[0].vlines(i["x1"], 0, i["x"], color="blue")
@@ -276,165 +1162,1077 @@ class Beam(object):
             else:
                 ax2[0].plot(
                     np.linspace(i["x1"], i["x2"]),
-                    [i["x"].subs(self.__x, j) for j in np.linspace(i["x1"], i["x2"])],
+                    _compile(i["x"])(np.linspace(i["x1"], i["x2"])),
                     color="blue",
                 )
                 ax2[1].plot(
                     np.linspace(i["x1"], i["x2"]),
-                    [i["y"].subs(self.__x, j) for j in np.linspace(i["x1"], i["x2"])],
+                    _compile(i["y"])(np.linspace(i["x1"], i["x2"])),
                     color="green",
                 )
         return (fig1, fig2)
 
+    def load_values(self, n: int = 50) -> dict:
+        """
+        return {"forces": [...], "moments": [...]} with each loading sampled as arrays
+
+        every entry has x1, x2, the stations xs and the x and y (or z) components on
+        them, a point loading has its single station at x1.
+        """
+
+        def sample(i: dict, keys: str) -> dict:
+            xs = np.linspace(i["x1"], i["x2"], 1 if i["x1"] == i["x2"] else n)
+            return {
+                "x1": i["x1"],
+                "x2": i["x2"],
+                "xs": xs,
+                **{k: _compile(i[k])(xs) for k in keys},
+            }
+
+        return {
+            "forces": [sample(i, "xy") for i in self.__floads],
+            "moments": [sample(i, "xz") for i in self.__mloads],
+        }
+
     def beam_geom(self):
         """
         return beam geometry parameters
         """
         return {
-            "Izz": latex(self.__Izz),
-            "Iyy": latex(self.__Iyy),
-            "ybar": latex(self.__ybar),
-            "ymax": latex(self.__ymax),
+            "Izz": sympy.latex(self.__Izz),
+            "Iyy": sympy.latex(self.__Iyy),
+            "ybar": sympy.latex(self.__ybar),
+            "ymax": sympy.latex(self.__ymax),
         }
 
     def calculate(self) -> bool:
         """
         solve the beam
+
+        with the symbolic engine each quantity is worked out the first time it is asked for.
         """
-        self.__statical_analysis()
-        self.__Mechanical_analaysis()
+        self.__changed()
+        if self.__engine == "numeric":
+            self.__numeric_analysis()
+        self.__solved = True
         return True
 
-    def reactions(self) -> dict:
-        """
-        return reaction forces and moments
-        """
-        if self.__xroller is None:
-            return {
-                "Nx": self.__Nx,
-                "Ny": self.__Ny,
-                "Mz": self.__MzN,
-                "Mx": self.__MxN,
-            }
-        return {
-            "Nx_pin": self.__Nx,
-            "Ny_pin": self.__Ny1,
-            "N_roller": self.__Ny2,
-            "Mx": self.__MxN,
+    def __getstate__(self) -> dict:
+        # compiled evaluators do not pickle, they are compiled again on use
+        state = self.__dict__.copy()
+        state["_Beam__evaluators"] = {
+            k: v for k, v in self.__evaluators.items() if isinstance(v, _Piecewise)
         }
+        state["_Beam__polynomials"] = {}
+        return state
 
-    def bending(self) -> dict:
+    def stations(self, n: int = 100):
         """
-        return w(x), V(x), M(x) in latex
+        return n evenly spaced stations over the beam
         """
-        return {"w": latex(self.__fyw), "V": latex(self.__v), "M": latex(self.__Mz)}
+        return np.linspace(0, self.__lenght, n)
 
-    def bending_plot(self):
+    def influence_line(self, quantity: str, section_x=None, positions=None):
         """
-        return fig of V(x) and M(x)
+        return the influence line of quantity at section_x for a unit load F = ĵ
+
+        quantity is V or Mz at the section, or the reaction Ny1, Ny2 (Ny, MzN for a
+        cantilever) where section_x is not needed. positions default to stations().
         """
-        fig, ax = plt.subplots(2, 1)
-        ax[0].set(title="Shear Force and Bending Moment", ylabel="V")
-        ax[1].set(xlabel="x", ylabel="M")
-        ax[0].plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
-            [
-                self.__v.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
-            ],
+        positions = (
+            self.stations() if positions is None else np.asarray(positions, dtype=float)
         )
-        ax[1].plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
-            [
-                self.__Mz.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
-            ],
-        )
-        return fig
+        if np.any(positions < 0) or np.any(positions > self.__lenght):
+            raise Exception("0 <= positions <= lenght")
+        if section_x is None and quantity in ("V", "Mz"):
+            raise Exception("section_x is needed for V and Mz")
+        return _influence(quantity, section_x, positions, self.__xpin, self.__xroller)
+
+    def load_train(self, weights, spacings, step: float = 0.1, xs=None) -> dict:
+        """
+        return the envelopes of V and Mz as a train of point loads crosses the beam
+
+        weights are the Fy of the axles from the front, spacings the distances between
+        neighbouring axles, which must be multiples of step. The result is
+        {quantity: {"max": values, "min": values, "max_at": lead, "min_at": lead}} at
+        the stations xs (stations() by default), lead being the position of the front
+        axle at the extreme.
+        """
+        weights = np.asarray(weights, dtype=float)
+        offsets = np.concatenate([[0.0], np.cumsum(spacings)]) / step
+        if len(offsets) != len(weights):
+            raise Exception("one spacing less than weights")
+        elif np.any(np.abs(offsets - np.round(offsets)) > 1e-9):
+            raise Exception("spacings must be multiples of step")
+        offsets = np.round(offsets).astype(int)
+        xs = self.stations() if xs is None else np.asarray(xs, dtype=float)
+
+        # every grid position is loaded once, the train is slid over the columns
+        n = int(np.ceil(self.__lenght / step - 1e-9))
+        positions = step * np.arange(-offsets[-1], n + offsets[-1] + 1)
+        on = (positions > -1e-9 * step) & (positions < self.__lenght + 1e-9 * step)
+        lead = positions[offsets[-1] :]
+        positions = np.clip(positions, 0, self.__lenght)
+        envelopes = {}
+        for q in ("V", "Mz"):
+            G = on * _influence(q, xs[:, None], positions, self.__xpin, self.__xroller)
+            values = sum(
+                w * G[:, offsets[-1] - o : G.shape[1] - o]
+                for w, o in zip(weights, offsets)
+            )
+            envelopes[q] = {
+                "max": values.max(axis=1),
+                "min": values.min(axis=1),
+                "max_at": lead[values.argmax(axis=1)],
+                "min_at": lead[values.argmin(axis=1)],
+            }
+        return envelopes
+
+    def superposition(self, positions=None, xs=None):
+        """
+        return the Superposition of unit loads for this geometry and supports
+        """
+        return Superposition(
+            self.__lenght,
+            self.__F,
+            self.__W,
+            self.__FT,
+            self.__WT,
+            self.__xpin,
+            self.__xroller,
+            positions,
+            xs,
+        )
+
+    def evaluate(self, quantities: list, xs) -> dict:
+        """
+        return {quantity: values at xs} as float64 arrays
+
+        quantities are taken from N, w, V, Mz, Mx, sigma, tau_y and tau_xy.
+        """
+        if not self.__solved:
+            raise Exception("calculate() the beam first")
+        if isinstance(quantities, str):
+            quantities = [quantities]
+        for q in quantities:
+            if q not in QUANTITIES:
+                raise Exception(f"unknown quantity {q}")
+        xs = np.asarray(xs, dtype=float)
+        if self.__engine == "numeric":
+            return {q: self.__evaluator(q)(xs) for q in quantities}
+        # one pass over xs for all of them, shared terms are evaluated once
+        key = tuple(quantities)
+        if key not in self.__evaluators:
+            self.__evaluators[key] = _compile_many(tuple(self.__result(q) for q in key))
+        values = dict(zip(key, self.__evaluators[key](xs)))
+        for q in key:
+            bulk = self.__bulk_diagram(q)
+            if bulk is not None:
+                values[q] = values[q] + bulk(xs)
+        return values
+
+    def reactions(self) -> dict:
+        """
+        return reaction forces and moments
+        """
+        if self.__xroller is None:
+            return {
+                "Nx": self.__result("Nx"),
+                "Ny": self.__result("Ny"),
+                "Mz": self.__result("MzN"),
+                "Mx": self.__result("MxN"),
+            }
+        return {
+            "Nx_pin": self.__result("Nx"),
+            "Ny_pin": self.__result("Ny1"),
+            "N_roller": self.__result("Ny2"),
+            "Mx": self.__result("MxN"),
+        }
+
+    def extrema(self, quantity: str) -> dict:
+        """
+        return {"max": (x, value), "min": (x, value)} of a quantity over the beam
+
+        every segment between breakpoints is smooth, so only its ends (left and right
+        limits) and the roots of its derivative are checked, no sampling.
+        """
+        if not self.__solved:
+            raise Exception("calculate() the beam first")
+        if quantity not in QUANTITIES:
+            raise Exception(f"unknown quantity {quantity}")
+        candidates = []
+        for a, b, f, roots in self.__segments(quantity):
+            xs = np.concatenate([[a, b], roots])
+            ys = np.broadcast_to(f(xs), xs.shape)
+            candidates += zip(xs.tolist(), ys.tolist())
+        # loads at the free end act at x = lenght itself
+        L = float(self.__lenght)
+        candidates.append((L, float(self.__end(quantity)[0])))
+        return {
+            "max": max(candidates, key=lambda i: i[1]),
+            "min": min(candidates, key=lambda i: i[1]),
+        }
+
+    def sample(self, quantity: str, tol: float = 1e-3):
+        """
+        return (xs, ys) of a quantity for plotting
+
+        every breakpoint is sampled twice, with its left and right limits, so jumps
+        stay vertical; smooth pieces are bisected until the polyline is within
+        tol * max |y| of the diagram. The last point is the value at x = lenght.
+        """
+        if not self.__solved:
+            raise Exception("calculate() the beam first")
+        if quantity not in QUANTITIES:
+            raise Exception(f"unknown quantity {quantity}")
+        pieces = []
+        for a, b, f, roots in self.__segments(quantity):
+            xs = np.unique(np.concatenate([[a, b], roots]))
+            pieces.append((f, xs, np.broadcast_to(f(xs), xs.shape)))
+        L = float(self.__lenght)
+        end = self.__end(quantity)
+        scale = max([np.abs(ys).max() for _, _, ys in pieces] + [abs(end[0])])
+        pieces = [_refine(f, xs, ys, tol * (scale or 1.0)) for f, xs, ys in pieces]
+        return (
+            np.concatenate([xs for xs, _ in pieces] + [[L]]),
+            np.concatenate([ys for _, ys in pieces] + [end]),
+        )
+
+    def segments(self, quantity: str) -> list:
+        """
+        return [(a, b, expression)] of a quantity, one polynomial per segment of [0, lenght]
+
+        neighbouring segments with the same expression are merged, a last entry
+        (lenght, lenght, expression) is the value at x = lenght when loads act there.
+        """
+        if not self.__solved:
+            raise Exception("calculate() the beam first")
+        if quantity not in QUANTITIES:
+            raise Exception(f"unknown quantity {quantity}")
+        rows = []
+        for a, b, c, p in self.__pieces(quantity):
+            if p is None:
+                x = sympy.symbols("x")
+                scale = 1e-12 * max(1.0, np.abs(c).max())
+                p = sum(
+                    (_number(k) * x**n for n, k in enumerate(c) if abs(k) > scale),
+                    _number(0),
+                )
+            if rows and rows[-1][2] == p:
+                rows[-1] = (rows[-1][0], b, p)
+            else:
+                rows.append((a, b, p))
+        return rows
+
+    def __points(self, quantity: str):
+        """
+        return the sorted breakpoints of a quantity on [0, lenght], both ends included
+        """
+        if self.__engine == "numeric":
+            points = self.__evaluators[quantity].breaks[1:]
+        else:
+            expr = self.__result(quantity)
+            points = [float(i.args[1]) for i in expr.atoms(sympy.SingularityFunction)]
+        return np.unique(
+            np.clip(np.concatenate([[0.0, self.__lenght], points]), 0.0, self.__lenght)
+        )
+
+    def __piece(self, expr, a: float):
+        """
+        expr right of a, where every <x - c>^n with c <= a is (x - c)^n and the others 0
+        """
+        x = self.__x
+        return expr.replace(
+            sympy.SingularityFunction,
+            lambda _, c, n: (x - c) ** n if c <= a and n >= 0 else 0,
+        )
+
+    def __pieces(self, quantity: str) -> list:
+        """
+        return [(a, b, c, g)] for the smooth pieces of a quantity on [0, lenght] and a
+        last (lenght, lenght, c, g) at x = lenght, worked out once per solve
+
+        c are the ascending coefficients of a polynomial piece, else None, and g its
+        expression, None with the numeric engine or where the array loads make it
+        a float polynomial.
+        """
+        if quantity in self.__polynomials:
+            return self.__polynomials[quantity]
+        points = self.__points(quantity)
+        L = float(self.__lenght)
+        bounds = [*zip(points[:-1].tolist(), points[1:].tolist()), (L, L)]
+        if self.__engine == "numeric":
+            pw = self.__evaluators[quantity]
+            rows = []
+            for a, b in bounds:
+                i = np.searchsorted(pw.breaks, (a + b) / 2, side="right") - 1
+                rows.append((a, b, pw.coeffs[i], None))
+            self.__polynomials[quantity] = rows
+            return rows
+        # every term joins the pieces from the first one starting at or after its
+        # singularity, so each piece is the one before plus what starts there
+        x = self.__x
+        starts = np.array([a for a, _ in bounds])
+        joins = [[] for _ in bounds]
+        others = []
+        expr = sympy.expand_mul(self.__result(quantity))
+        for term in sympy.Add.make_args(expr):
+            coeff, sf = term.as_independent(sympy.SingularityFunction, as_Add=False)
+            if sf == 1:
+                joins[0].append((term, 0, 0))
+            elif not isinstance(sf, sympy.SingularityFunction):
+                others.append(term)
+            elif sf.args[2] >= 0 and float(sf.args[1]) <= L:
+                _, c, n = sf.args
+                joins[np.searchsorted(starts, float(c))].append((coeff, c, int(n)))
+        others = sympy.Add(*others)
+        rows = []
+        # ascending coefficients of the constant terms, expand() is slow on them
+        coeffs = []
+        g = sympy.Integer(0)
+        for (a, b), terms in zip(bounds, joins):
+            for coeff, c, n in terms:
+                if coeff.has(x):
+                    g = g + sympy.expand(coeff * (x - c) ** n)
+                    continue
+                coeffs += [sympy.Integer(0)] * (n + 1 - len(coeffs))
+                for k in range(n + 1):
+                    coeffs[k] += coeff * comb(n, k) * (-c) ** (n - k)
+            p = sympy.Add(*(k * x**n for n, k in enumerate(coeffs)), g)
+            if others:
+                p = p + sympy.expand(self.__piece(others, a))
+            if p == 0:
+                c = np.zeros(1)
+            elif not (g or others):
+                c = np.array([float(k) for k in coeffs])
+            else:
+                c = np.asarray(_coefficients(p)) if p.is_polynomial(x) else None
+            rows.append((a, b, c, p))
+        bulk = self.__bulk_diagram(quantity)
+        if bulk is not None:
+            rows = self.__with_bulk(rows, bulk)
+        self.__polynomials[quantity] = rows
+        return rows
+
+    def __with_bulk(self, rows: list, bulk):
+        """
+        return the pieces rows plus the array loads' share bulk, split at its breaks
+        """
+        L = float(self.__lenght)
+        starts = np.array([a for a, *_ in rows])
+        points = np.unique(np.clip(np.concatenate([starts, bulk.breaks[1:]]), 0.0, L))
+        lo = np.concatenate([points[:-1], [L]])
+        hi = np.concatenate([points[1:], [L]])
+        mine = np.searchsorted(starts, lo, side="right") - 1
+        theirs = bulk.coeffs[
+            np.searchsorted(bulk.breaks, (lo + hi) / 2, side="right") - 1
+        ]
+        x = self.__x
+        merged = []
+        for a, b, i, k in zip(lo.tolist(), hi.tolist(), mine.tolist(), theirs):
+            _, _, c, g = rows[i]
+            if c is not None:
+                merged.append((a, b, P.polyadd(c, k), None))
+            else:
+                g = g + sum(_number(v) * x**n for n, v in enumerate(k) if v)
+                merged.append((a, b, None, g))
+        return merged
+
+    def __end(self, quantity: str):
+        """
+        return the value of a quantity at x = lenght as an array
+        """
+        _, L, c, g = self.__pieces(quantity)[-1]
+        return np.atleast_1d(_horner(c, L) if c is not None else _compile(g)(L))
+
+    def __segments(self, quantity: str):
+        """
+        return [(a, b, f, roots)] for the smooth pieces of a quantity on [0, lenght]
+        """
+        key = (quantity, "roots")
+        if key in self.__polynomials:
+            return self.__polynomials[key]
+        segments = []
+        for a, b, c, g in self.__pieces(quantity)[:-1]:
+            if c is not None:
+                segments.append(
+                    (a, b, lambda xs, c=c: _horner(c, xs), _critical_points(c, a, b))
+                )
+                continue
+            # no closed form for the roots, bracket the sign changes of g'
+            x = self.__x
+            dg = sympy.diff(g, x)
+            xs = np.linspace(a, b, 65)
+            ys = _compile(dg)(xs)
+            roots = [
+                float(sympy.nsolve(dg, x, (lo, hi), solver="bisect"))
+                for lo, hi, y0, y1 in zip(xs[:-1], xs[1:], ys[:-1], ys[1:])
+                if y0 * y1 < 0
+            ]
+            segments.append((a, b, _compile(g), np.asarray(roots)))
+        self.__polynomials[key] = segments
+        return segments
+
+    def bending(self) -> dict:
+        """
+        return w(x), V(x), M(x) in latex
+        """
+        return {
+            "w": sympy.latex(self.__output("w")),
+            "V": sympy.latex(self.__output("V")),
+            "M": sympy.latex(self.__output("Mz")),
+        }
+
+    def bending_plot(self):
+        """
+        return fig of V(x) and M(x)
+        """
+        fig = figure.Figure()
+        ax = fig.subplots(2, 1)
+        ax[0].set(title="Shear Force and Bending Moment", ylabel="V")
+        ax[1].set(xlabel="x", ylabel="M")
+        ax[0].plot(*self.sample("V"))
+        ax[1].plot(*self.sample("Mz"))
+        return fig
 
     def torque(self):
         """
         return M_x(x) in latex
         """
-        return latex(self.__Mx)
+        return sympy.latex(self.__output("Mx"))
 
     def torqe_plot(self):
         """
         return fig of T(x)
         """
-        fig, ax = plt.subplots()
+        fig = figure.Figure()
+        ax = fig.subplots()
         ax.set(title="Torque", ylabel=r"$M_{x}(x)$")
-        ax.plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
-            [
-                self.__Mx.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
-            ],
-        )
+        ax.plot(*self.sample("Mx"))
         return fig
 
     def tau_y_max(self):
         """
         return tau_y_max(x) in latex
         """
-        return latex(self.__tauy)
+        return sympy.latex(self.__output("tau_y"))
 
     def tau_y_max_plot(self):
         """
         return fig of tau_y_max(x)
         """
-        fig, ax = plt.subplots()
+        fig = figure.Figure()
+        ax = fig.subplots()
         ax.set(title=r"$\tau_{y,max}$", ylabel=r"$\tau_{y,max}(x)$")
-        ax.plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
-            [
-                self.__tauy.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
-            ],
-        )
+        ax.plot(*self.sample("tau_y"))
         return fig
 
     def normal_stress_max(self):
         """
         return max sigma(x) in latex
         """
-        return latex(self.__sigma)
+        return sympy.latex(self.__output("sigma"))
 
     def normal_stress_max_plot(self):
         """
         return fig of max sigma(x)
         """
-        fig, ax = plt.subplots()
+        fig = figure.Figure()
+        ax = fig.subplots()
         ax.set(title=r"$\sigma_{x,max}$", ylabel=r"$\sigma_{x,max}(x)$")
-        ax.plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
-            [
-                self.__sigma.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
-            ],
-        )
+        ax.plot(*self.sample("sigma"))
         return fig
 
     def tau_xy_max(self):
         """
         return tau_xy_max(x) in latex
         """
-        return latex(self.__tauxy)
+        return sympy.latex(self.__output("tau_xy"))
 
     def tau_xy_max_plot(self):
         """
         return fig of tau_xy_max(x)
         """
-        fig, ax = plt.subplots()
+        fig = figure.Figure()
+        ax = fig.subplots()
         ax.set(title=r"$\tau_{xy,max}$", ylabel=r"$\tau_{xy,max}(x)$")
-        ax.plot(
-            np.linspace(0, self.__lenght * 0.99, 100),
+        ax.plot(*self.sample("tau_xy"))
+        return fig
+
+
+def _ramp(xs, a, n: int):
+    """
+    <xs - a>^n for n in 0, 1, 2 with broadcasting, impulses are dropped
+    """
+    if n == 0:
+        return (xs >= a).astype(float)
+    return np.maximum(xs - a, 0.0) ** n
+
+
+def _influence(quantity: str, xs, positions, xpin: float, xroller):
+    """
+    response at the sections xs to a unit load F = ĵ at positions, broadcast together
+    """
+    Ny = -np.ones(np.shape(positions))
+    MzN = -(positions - xpin)
+    if xroller is None:
+        reactions = {"Ny": Ny, "MzN": MzN}
+    else:
+        Ny2 = MzN / (xroller - xpin)
+        reactions = {"Ny1": Ny - Ny2, "Ny2": Ny2}
+    if quantity in reactions:
+        return reactions[quantity]
+    if quantity not in ("V", "Mz"):
+        raise Exception(f"unknown quantity {quantity}")
+    xs = np.asarray(xs, dtype=float)
+    n = 0 if quantity == "V" else 1
+    values = _ramp(xs, positions, n)
+    if xroller is None:
+        values = values + Ny * _ramp(xs, xpin, n)
+        if n:
+            values = values - MzN * _ramp(xs, xpin, 0)
+    else:
+        values = values + reactions["Ny1"] * _ramp(xs, xpin, n)
+        values = values + reactions["Ny2"] * _ramp(xs, xroller, n)
+    return values
+
+
+class BeamBatch(object):
+    def __init__(
+        self,
+        lenght,
+        F,
+        W,
+        FT,
+        WT,
+        xpin=0.0,
+        xroller=None,
+    ) -> None:
+        """
+        Analysis of many beams with uniform and point loads at once.
+
+        Args:
+            Same as Beam, every argument is a float or an array with one entry per case.
+
+            If xroller is None, all the cases are cantilevers.
+        """
+        (
+            self.__lenght,
+            self.__F,
+            self.__W,
+            self.__FT,
+            self.__WT,
+            self.__xpin,
+        ) = np.broadcast_arrays(
+            *(
+                np.atleast_1d(np.asarray(i, dtype=float))
+                for i in (lenght, F, W, FT, WT, xpin)
+            )
+        )
+        self.__xroller = (
+            None
+            if xroller is None
+            else np.broadcast_to(np.asarray(xroller, dtype=float), self.__xpin.shape)
+        )
+        if self.__xroller is not None and np.any(self.__xpin == self.__xroller):
+            raise Exception("xpin and xroller are the same!")
+        F, W, FT, WT = self.__F, self.__W, self.__FT, self.__WT
+
+        self.__Area = W * WT + F * FT
+        self.__C1W = 1 / 3 * (1 - 0.63 * W / WT)
+        self.__C1F = 1 / 3 * (1 - 0.63 * F / FT)
+
+        self.__ybar = (W / 2 * W * WT + W * F * FT) / self.__Area
+        self.__ymax = np.where(self.__ybar > W / 2, -self.__ybar, W - self.__ybar)
+        self.__Izz = (
+            FT * F**3 / 12
+            + F * FT * (W - self.__ybar) ** 2
+            + W * WT**3 / 12
+            + W * WT * (W / 2 - self.__ybar)
+        )
+
+        self.__Iyy = (
+            F * FT**3 / 12
+            + F * FT * (W - self.__ybar) ** 2
+            + WT * W**3 / 12
+            + W * WT * (W / 2 - self.__ybar)
+        )
+
+        self.__floads = []
+        self.__mloads = []
+
+    def __load(self, a, b, x1, x2) -> dict:
+        x1 = np.broadcast_to(np.asarray(x1, dtype=float), self.__xpin.shape)
+        x2 = x1 if x2 is None else np.asarray(x2, dtype=float)
+        x2 = np.broadcast_to(x2, self.__xpin.shape)
+        if np.any(x1 > x2):
+            raise Exception("x1 <= x2")
+        elif np.any(x2 > self.__lenght):
+            raise Exception("x2 <= lenght")
+        return {
+            "a": np.broadcast_to(np.asarray(a, dtype=float), self.__xpin.shape),
+            "b": np.broadcast_to(np.asarray(b, dtype=float), self.__xpin.shape),
+            "x1": x1,
+            "x2": x2,
+            # point loads have no span, their resultant is the load itself
+            "span": np.where(x1 == x2, 1.0, x2 - x1),
+            "point": x1 == x2,
+        }
+
+    def floading(self, x, y, x1, x2=None) -> None:
+        """
+        F = Fx î + Fy ĵ, [x1, x2], constant on the span
+
+        if x2 is None it is point loading.
+        """
+        load = self.__load(x, y, x1, x2)
+        self.__floads.append({"x": load.pop("a"), "y": load.pop("b"), **load})
+
+    def mloading(self, x, z, x1, x2=None) -> None:
+        """
+        M = Mx î + Mz k̂, [x1, x2], constant on the span
+
+        if x2 is None it is point loading.
+        """
+        load = self.__load(x, z, x1, x2)
+        self.__mloads.append({"x": load.pop("a"), "z": load.pop("b"), **load})
+
+    def beam_geom(self) -> dict:
+        """
+        return beam geometry parameters
+        """
+        return {
+            "Area": self.__Area,
+            "Izz": self.__Izz,
+            "Iyy": self.__Iyy,
+            "ybar": self.__ybar,
+            "ymax": self.__ymax,
+        }
+
+    def calculate(self) -> bool:
+        """
+        solve the reactions of every case
+        """
+        zero = np.zeros(self.__xpin.shape)
+        self.__Nx = -sum((i["x"] * i["span"] for i in self.__floads), zero)
+        self.__Ny = -sum((i["y"] * i["span"] for i in self.__floads), zero)
+        self.__MzN = -sum(
+            (
+                i["y"]
+                * np.where(
+                    i["point"],
+                    i["x1"] - self.__xpin,
+                    (i["x2"] ** 2 - i["x1"] ** 2) / 2 - self.__xpin * i["span"],
+                )
+                for i in self.__floads
+            ),
+            zero,
+        ) - sum((i["z"] * i["span"] for i in self.__mloads), zero)
+        self.__MxN = -sum((i["x"] * i["span"] for i in self.__mloads), zero)
+        if self.__xroller is not None:
+            self.__Ny2 = self.__MzN / (self.__xroller - self.__xpin)
+            self.__Ny1 = self.__Ny - self.__Ny2
+        return True
+
+    def reactions(self) -> dict:
+        """
+        return reaction forces and moments, one entry per case
+        """
+        if self.__xroller is None:
+            return {
+                "Nx": self.__Nx,
+                "Ny": self.__Ny,
+                "Mz": self.__MzN,
+                "Mx": self.__MxN,
+            }
+        return {
+            "Nx_pin": self.__Nx,
+            "Ny_pin": self.__Ny1,
+            "N_roller": self.__Ny2,
+            "Mx": self.__MxN,
+        }
+
+    def stations(self, n: int = 100):
+        """
+        return n evenly spaced stations over every beam, shape (n_cases, n)
+        """
+        return self.__lenght[:, None] * np.linspace(0, 1, n)
+
+    def __span(self, loads: list, key: str, xs, n: int):
+        """
+        sum of the n-th integrals of loads[key], impulses of point loads included
+        """
+        total = np.zeros(xs.shape)
+        for i in loads:
+            x1, x2 = i["x1"][:, None], i["x2"][:, None]
+            total += i[key][:, None] * np.where(
+                i["point"][:, None],
+                _ramp(xs, x1, n - 1),
+                (_ramp(xs, x1, n) - _ramp(xs, x2, n)) / n,
+            )
+        return total
+
+    def evaluate(self, quantities: list, xs=None) -> dict:
+        """
+        return {quantity: values} as (n_cases, n_stations) arrays
+
+        quantities are taken from N, w, V, Mz, Mx, sigma, tau_y and tau_xy, xs are the
+        stations of every case (defaults to stations()) or one row shared by all.
+        """
+        if isinstance(quantities, str):
+            quantities = [quantities]
+        xs = self.stations() if xs is None else np.asarray(xs, dtype=float)
+        xs = np.broadcast_to(xs, self.__xpin.shape + xs.shape[-1:])
+        xpin = self.__xpin[:, None]
+        values = {}
+
+        def get(q):
+            if q in values:
+                return values[q]
+            if q == "w":
+                values[q] = -sum(
+                    (
+                        np.where(i["point"], 0.0, i["y"])[:, None]
+                        * (
+                            _ramp(xs, i["x1"][:, None], 0)
+                            - _ramp(xs, i["x2"][:, None], 0)
+                        )
+                        for i in self.__floads
+                    ),
+                    np.zeros(xs.shape),
+                )
+            elif q == "N":
+                values[q] = -(
+                    self.__Nx[:, None] * _ramp(xs, xpin, 0)
+                    + self.__span(self.__floads, "x", xs, 1)
+                )
+            elif q == "V":
+                values[q] = self.__span(self.__floads, "y", xs, 1)
+                if self.__xroller is None:
+                    values[q] += self.__Ny[:, None] * _ramp(xs, xpin, 0)
+                else:
+                    values[q] += self.__Ny1[:, None] * _ramp(xs, xpin, 0)
+                    values[q] += self.__Ny2[:, None] * _ramp(
+                        xs, self.__xroller[:, None], 0
+                    )
+            elif q == "Mz":
+                values[q] = self.__span(self.__floads, "y", xs, 2)
+                for i in self.__mloads:
+                    # point moment as in Beam, distributed moments add their span
+                    values[q] -= i["z"][:, None] * _ramp(xs, i["x1"][:, None], 0)
+                    values[q] -= np.where(
+                        i["point"][:, None],
+                        0.0,
+                        i["z"][:, None]
+                        * (
+                            _ramp(xs, i["x1"][:, None], 1)
+                            - _ramp(xs, i["x2"][:, None], 1)
+                        ),
+                    )
+                if self.__xroller is None:
+                    values[q] += self.__Ny[:, None] * _ramp(xs, xpin, 1)
+                    values[q] -= self.__MzN[:, None] * _ramp(xs, xpin, 0)
+                else:
+                    values[q] += self.__Ny1[:, None] * _ramp(xs, xpin, 1)
+                    values[q] += self.__Ny2[:, None] * _ramp(
+                        xs, self.__xroller[:, None], 1
+                    )
+            elif q == "Mx":
+                values[q] = -(
+                    self.__MxN[:, None] * _ramp(xs, xpin, 0)
+                    + self.__span(self.__mloads, "x", xs, 1)
+                )
+            elif q == "sigma":
+                values[q] = (
+                    get("N") / self.__Area[:, None]
+                    - get("Mz") * (self.__ymax / self.__Izz)[:, None]
+                )
+            elif q == "tau_y":
+                values[q] = (
+                    get("Mx")
+                    * (
+                        1 / self.__C1W / self.__WT / self.__W**2
+                        + 1 / self.__C1F / self.__FT / self.__F**2
+                    )[:, None]
+                )
+            elif q == "tau_xy":
+                values[q] = (
+                    get("V")
+                    * (self.__WT * self.__ybar**2 / 2 / self.__Iyy / self.__WT)[
+                        :, None
+                    ]
+                )
+            else:
+                raise Exception(f"unknown quantity {q}")
+            return values[q]
+
+        return {q: get(q) for q in quantities}
+
+
+class Superposition(object):
+    def __init__(
+        self,
+        lenght: float,
+        F: float,
+        W: float,
+        FT: float,
+        WT: float,
+        xpin: float = 0.0,
+        xroller: float | None = None,
+        positions=None,
+        xs=None,
+    ) -> None:
+        """
+        Unit-load responses of one beam, load sets are then evaluated as matrix products.
+
+        Args:
+            Same as Beam for the geometry and the supports.
+
+            positions are the breakpoints of the loads, unit point loads act at every
+            position and unit uniform loads between neighbouring positions. They default
+            to the beam ends and the supports.
+
+            xs are the stations, 100 evenly spaced ones by default.
+        """
+        if positions is None:
+            positions = [0.0, lenght, xpin] + ([] if xroller is None else [xroller])
+        self.__positions = np.unique(np.asarray(positions, dtype=float))
+        self.__xs = (
+            np.linspace(0, lenght, 100) if xs is None else np.asarray(xs, dtype=float)
+        )
+        p = self.__positions
+        self.__basis = [(c, a, a) for c in ("Fx", "Fy", "Mx", "Mz") for a in p] + [
+            (c, a, b) for c in ("Fx", "Fy", "Mx", "Mz") for a, b in zip(p[:-1], p[1:])
+        ]
+
+        # every unit load is one case of a batch
+        component = np.array([i[0] for i in self.__basis])
+        x1 = np.array([i[1] for i in self.__basis])
+        x2 = np.array([i[2] for i in self.__basis])
+        batch = BeamBatch(
+            lenght, F, W, FT, WT, np.full(len(self.__basis), float(xpin)), xroller
+        )
+        batch.floading(component == "Fx", component == "Fy", x1, x2)
+        batch.mloading(component == "Mx", component == "Mz", x1, x2)
+        batch.calculate()
+        values = batch.evaluate(QUANTITIES, self.__xs)
+        # (n_basis, n_quantities, n_stations)
+        self.__responses = np.stack([values[q] for q in QUANTITIES], axis=1)
+        reactions = batch.reactions()
+        self.__reaction_names = list(reactions)
+        self.__reactions = np.stack(list(reactions.values()), axis=1)
+
+    def basis(self) -> list:
+        """
+        return the unit loads as (component, x1, x2), x1 == x2 for point loads
+        """
+        return list(self.__basis)
+
+    def stations(self):
+        return self.__xs
+
+    def weights(self, loads: list):
+        """
+        return the weights of a load set, loads are (component, value, x1, x2=None)
+
+        component is Fx, Fy, Mx or Mz. Point loads and the ends of uniform loads must
+        be positions. A uniform Fx, Fy or Mx load may span several positions, a uniform
+        Mz load must lie between neighbouring ones: Beam also applies its whole value
+        as a moment at x1, so its pieces do not add up to it.
+        """
+        weights = np.zeros(len(self.__basis))
+        p = self.__positions
+        for component, value, x1, *x2 in loads:
+            x2 = x1 if not x2 or x2[0] is None else x2[0]
+            if x1 not in p or x2 not in p:
+                raise Exception(f"[{x1}, {x2}] does not start and end at positions")
+            elif component == "Mz" and np.any((p > x1) & (p < x2)):
+                raise Exception(f"uniform Mz on [{x1}, {x2}] spans several positions")
+            for j, (c, a, b) in enumerate(self.__basis):
+                if c != component:
+                    continue
+                if (x1 == x2 and a == b == x1) or (x1 < x2 and x1 <= a < b <= x2):
+                    weights[j] += value
+        return weights
+
+    def evaluate(self, weights, quantities=QUANTITIES) -> dict:
+        """
+        return {quantity: values at the stations} for one or many load sets
+
+        weights has one row of basis() weights per load set, the result has the
+        same number of rows.
+        """
+        if isinstance(quantities, str):
+            quantities = [quantities]
+        for q in quantities:
+            if q not in QUANTITIES:
+                raise Exception(f"unknown quantity {q}")
+        weights = np.asarray(weights, dtype=float)
+        index = [QUANTITIES.index(q) for q in quantities]
+        responses = self.__responses[:, index, :]
+        # all the load sets and quantities in one matrix product
+        values = np.atleast_2d(weights) @ responses.reshape(len(self.__basis), -1)
+        values = values.reshape(-1, len(index), len(self.__xs))
+        if weights.ndim == 1:
+            values = values[0]
+        return {q: values[..., i, :] for i, q in enumerate(quantities)}
+
+    def reactions(self, weights) -> dict:
+        """
+        return the reactions of one or many load sets
+        """
+        values = np.asarray(weights, dtype=float) @ self.__reactions
+        return {k: values[..., i] for i, k in enumerate(self.__reaction_names)}
+
+
+class LoadCases(object):
+    def __init__(
+        self,
+        lenght: float,
+        F: float,
+        W: float,
+        FT: float,
+        WT: float,
+        xpin: float = 0.0,
+        xroller: float | None = None,
+        engine: str = "symbolic",
+    ) -> None:
+        """
+        Named load cases of one beam and their factored combinations.
+
+        Args:
+            Same as Beam, every case is a Beam with these arguments.
+        """
+        self.__args = (lenght, F, W, FT, WT, xpin, xroller, engine)
+        self.__lenght = lenght
+        self.__cases = {}
+        self.__combinations = {}
+
+    def case(self, name: str) -> Beam:
+        """
+        return the Beam of a load case, load it with floading and mloading
+        """
+        if name not in self.__cases:
+            self.__cases[name] = Beam(*self.__args)
+        return self.__cases[name]
+
+    def combination(self, name: str, factors: dict) -> None:
+        """
+        factors is {case: factor}, cases left out have no share
+        """
+        for i in factors:
+            if i not in self.__cases:
+                raise Exception(f"unknown load case {i}")
+        self.__combinations[name] = dict(factors)
+
+    def combinations(self) -> list:
+        return list(self.__combinations)
+
+    def __factors(self):
+        """
+        (n_combinations, n_cases) matrix of the factors
+        """
+        if not self.__combinations:
+            raise Exception("add a combination first")
+        return np.array(
             [
-                self.__tauxy.subs(self.__x, i)
-                for i in np.linspace(0, self.__lenght * 0.99, 100)
+                [factors.get(i, 0.0) for i in self.__cases]
+                for factors in self.__combinations.values()
             ],
+            dtype=float,
+        )
+
+    def calculate(self) -> bool:
+        """
+        solve every load case once
+        """
+        for beam in self.__cases.values():
+            beam.calculate()
+        return True
+
+    def reactions(self) -> dict:
+        """
+        return the reactions of every combination
+        """
+        cases = [
+            {k: float(v) for k, v in beam.reactions().items()}
+            for beam in self.__cases.values()
+        ]
+        factors = self.__factors()
+        return {k: factors @ np.array([i[k] for i in cases]) for k in cases[0]}
+
+    def evaluate(self, quantities: list, xs=None) -> dict:
+        """
+        return {quantity: values} as (n_combinations, n_stations) arrays
+        """
+        if isinstance(quantities, str):
+            quantities = [quantities]
+        xs = np.linspace(0, self.__lenght, 100) if xs is None else xs
+        cases = [beam.evaluate(quantities, xs) for beam in self.__cases.values()]
+        factors = self.__factors()
+        # all the quantities are linear in the loads
+        return {
+            q: factors @ np.stack([np.broadcast_to(i[q], np.shape(xs)) for i in cases])
+            for q in quantities
+        }
+
+    def envelopes(self, quantities: list = QUANTITIES, xs=None) -> dict:
+        """
+        return {quantity: {"max": values, "min": values, "max_at": names, "min_at": names}}
+
+        names are the combinations that give the extremes at every station.
+        """
+        names = np.array(list(self.__combinations))
+        envelopes = {}
+        for q, values in self.evaluate(quantities, xs).items():
+            envelopes[q] = {
+                "max": values.max(axis=0),
+                "min": values.min(axis=0),
+                "max_at": names[values.argmax(axis=0)],
+                "min_at": names[values.argmin(axis=0)],
+            }
+        return envelopes
+
+
+def _warm() -> None:
+    # pay for the sympy import and its caches once per worker
+    x = sympy.symbols("x")
+    _integrate(x * sympy.SingularityFunction(x, 1, 0), x)
+
+
+def _solve(beam: Beam, quantities: tuple, n: int) -> dict:
+    beam.calculate()
+    xs = beam.stations(n)
+    return {
+        "reactions": {k: float(v) for k, v in beam.reactions().items()},
+        "x": xs,
+        **beam.evaluate(quantities, xs),
+    }
+
+
+def solve_many(
+    beams: list, workers: int | None = None, quantities=QUANTITIES, n: int = 100
+) -> list:
+    """
+    calculate() every beam in a process pool
+
+    returns one dict per beam with float reactions, the n stations as x and the
+    quantities sampled on them, in the order of beams.
+    """
+    quantities = tuple(quantities)
+    workers = workers or os.cpu_count()
+    if workers <= 1:
+        return [_solve(i, quantities, n) for i in beams]
+    with ProcessPoolExecutor(workers, initializer=_warm) as pool:
+        return list(
+            pool.map(
+                _solve,
+                beams,
+                [quantities] * len(beams),
+                [n] * len(beams),
+                chunksize=max(1, len(beams) // (workers * 4)),
+            )
         )
-        return fig
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -27,6 +28,14 @@ DEBUG = False
 
 ALLOWED_HOSTS = ['*']
 STATIC_ROOT = '/var/www/html/static'
+# solved beams kept in memory, BEAM_CACHE_DIR also keeps them on disk and shares
+# them between worker processes; without it an image is only rebuilt for the current inputs
+BEAM_CACHE_SIZE = 128
+BEAM_CACHE_DIR = None
+# processes rendering the result images, 1 renders on the request thread
+BEAM_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+# seconds SymPy gets to integrate a load before it is integrated numerically
+BEAM_INTEGRATION_TIMEOUT = 2.0
 CORS_ORIGIN_ALLOW_ALL = True
 SECURE_CROSS_ORIGIN_OPENER_POLICY = None
 
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class ResultCache(object):
+    """
+    LRU cache of solved beams, kept in memory and optionally in a directory.
+    """
+
+    def __init__(self, size=128, directory=None, disk_size=1024):
+        self.size = size
+        self.directory = directory
+        self.disk_size = disk_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """
+        sha256 of the canonical json of parts
+        """
+        data = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.pickle')
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), 'rb') as f:
+                value = pickle.load(f)
+            os.utime(self.path(key))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self.remember(key, value)
+        return value
+
+    def set(self, key, value):
+        self.remember(key, value)
+        if self.directory is None:
+            return
+        tmp = self.path(key) + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def remember(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def evict(self):
+        # least recently used files go first, reads touch their file
+        files = [os.path.join(self.directory, i) for i in os.listdir(self.directory)
+                 if i.endswith('.pickle')]
+        if len(files) <= self.disk_size:
+            return
+        files.sort(key=mtime)
+        for i in files[:len(files) - self.disk_size]:
+            try:
+                os.remove(i)
+            except OSError:
+                pass
+
+
+def mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0
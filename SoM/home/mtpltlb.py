@@ -1,11 +1,51 @@
-import matplotlib.pyplot as plt
+from functools import lru_cache
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+import numpy as np
 import re
 import subprocess
 import sys
 # from information import w, v, m
 
+# rendered rows kept per process, one row is about 0.9 MB
+TILES = 64
+
+
+@lru_cache(maxsize=TILES)
+def tile(title, demo, shade):
+    """
+    one row of the sheet as an rgb array, cached by its title and latex
+    """
+    # Colors used in Matplotlib online documentation.
+    mpl_grey_rgb = (51 / 255, 51 / 255, 51 / 255)
+
+    # a row of the old 23x16 sheet, which held 11 rows in 90% of its height
+    fig = Figure(figsize=(23, 16 * 0.90 / 11))
+    ax = fig.add_axes([0.01, 0, 0.98, 1], facecolor="white", frameon=False)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    fill_color = ['white', 'tab:blue'][shade]
+    ax.axhspan(0, 1, color=fill_color, alpha=0.2)
+    ax.annotate(rf'{title}:',
+                xy=(0.06, 0.7),
+                color=mpl_grey_rgb, weight='bold', fontsize=22)
+    ax.annotate(demo,
+                xy=(0.04, 0.25),
+                color=mpl_grey_rgb, fontsize=18)
+
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    rgb = np.asarray(canvas.buffer_rgba())[:, :, :3].copy()
+    fig.clear()
+    return rgb
+
 class tex_plot(object):
-    def __init__(self, w, v, m, sigma_max, tau_y_max, tau_xy_max, torque, ybar, ymax, Iyy, Izz) -> None:
+    def __init__(self, w, v, m, sigma_max, tau_y_max, tau_xy_max, torque, ybar, ymax, Iyy, Izz,
+                 fname='/var/www/html/static/latex.png') -> None:
         mathtext_demos = {
             "W(x)": rf'${w}$',
             "V(x)": rf'${v}$',
@@ -20,41 +60,6 @@ class tex_plot(object):
             "$I_{zz}$": rf'${Izz}$'
         }
         
-        n_lines = len(mathtext_demos)
-
-
-        def doall():
-            # Colors used in Matplotlib online documentation.
-            mpl_grey_rgb = (51 / 255, 51 / 255, 51 / 255)
-
-            # Creating figure and axis.
-            fig = plt.figure(figsize=(23,16))
-            ax = fig.add_axes([0.01, 0.01, 0.98, 0.90],
-                            facecolor="white", frameon=True)
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            # ax.set_title("Matplotlib's math rendering engine",
-            #              color=mpl_grey_rgb, fontsize=14, weight='bold')
-            ax.set_xticks([])
-            ax.set_yticks([])
-
-            # Gap between lines in axes coords
-            line_axesfrac = 1 / n_lines
-
-            for i_line, (title, demo) in enumerate(mathtext_demos.items()):
-
-                baseline = 1 - i_line * line_axesfrac
-                baseline_next = baseline - line_axesfrac
-                fill_color = ['white', 'tab:blue'][i_line % 2]
-                ax.axhspan(baseline, baseline_next, color=fill_color, alpha=0.2)
-                ax.annotate(rf'{title}:',
-                            xy=(0.06, baseline - 0.3 * line_axesfrac),
-                            color=mpl_grey_rgb, weight='bold', fontsize=22)
-                ax.annotate(demo,
-                            xy=(0.04, baseline - 0.75 * line_axesfrac),
-                            color=mpl_grey_rgb, fontsize=18)
-
-            plt.savefig('/var/www/html/static/latex.png')
-            # plt.show()
-
-        doall()
+        # every row is drawn on its own and cached, the sheet only stacks them
+        rows = [tile(title, demo, i_line % 2) for i_line, (title, demo) in enumerate(mathtext_demos.items())]
+        imsave(fname, np.vstack(rows), format='png')
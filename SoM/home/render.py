@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from .mtpltlb import tex_plot
+
+
+pool = None
+pool_lock = threading.Lock()
+
+
+def latex_png(*expressions):
+    buffer = BytesIO()
+    tex_plot(*expressions, buffer)
+    return buffer.getvalue()
+
+
+class Deferred(Future):
+    """
+    future that runs its call on the first thread asking for the result
+    """
+
+    def __init__(self, function, *args):
+        super().__init__()
+        self.call = (function, args)
+        self.lock = threading.RLock()
+
+    def result(self, timeout=None):
+        with self.lock:
+            if not self.done():
+                function, args = self.call
+                try:
+                    self.set_result(function(*args))
+                except Exception as e:
+                    self.set_exception(e)
+        return super().result(timeout)
+
+
+def submit(function, *args):
+    """
+    run function(*args) in the render pool and return its future
+
+    agg holds the GIL while drawing, so the pool uses processes; with
+    BEAM_RENDER_WORKERS <= 1 the call runs when its result is first asked for.
+    """
+    global pool
+    workers = getattr(settings, 'BEAM_RENDER_WORKERS', min(4, os.cpu_count() or 1))
+    if workers <= 1:
+        return Deferred(function, *args)
+    with pool_lock:
+        if pool is None:
+            # forking a threaded server can copy a held lock into the child
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            pool = ProcessPoolExecutor(workers, mp_context=context)
+    return pool.submit(function, *args)
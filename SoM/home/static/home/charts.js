@@ -0,0 +1,86 @@
+// draws the loads and diagrams of /calculate/<key>/data/, the analysis of the page,
+// on the canvas.chart elements
+(function () {
+  var url = document.currentScript.dataset.url;
+  var colors = { x: "blue", y: "green", z: "orange" };
+
+  function bounds(span, series) {
+    // the whole beam is always shown, the loads may cover part of it
+    var xmin = span[0], xmax = span[1], ymin = 0, ymax = 0;
+    series.forEach(function (s) {
+      s.xs.forEach(function (x, i) {
+        // null where the value is not finite
+        if (x === null || s.ys[i] === null) { return; }
+        xmin = Math.min(xmin, x);
+        xmax = Math.max(xmax, x);
+        ymin = Math.min(ymin, s.ys[i]);
+        ymax = Math.max(ymax, s.ys[i]);
+      });
+    });
+    if (xmin === xmax) { xmin -= 1; xmax += 1; }
+    if (ymin === ymax) { ymin -= 1; ymax += 1; }
+    return { xmin: xmin, xmax: xmax, ymin: ymin, ymax: ymax };
+  }
+
+  function draw(canvas, span, series) {
+    canvas.width = canvas.clientWidth;
+    canvas.height = canvas.clientHeight;
+    var ctx = canvas.getContext("2d");
+    var left = 70, right = 15, top = 25, bottom = 25;
+    var w = canvas.width - left - right, h = canvas.height - top - bottom;
+    var b = bounds(span, series);
+    function X(x) { return left + (x - b.xmin) / (b.xmax - b.xmin) * w; }
+    function Y(y) { return top + (b.ymax - y) / (b.ymax - b.ymin) * h; }
+
+    ctx.font = "12px sans-serif";
+    ctx.fillStyle = "#001570";
+    ctx.fillText(canvas.dataset.title, left, 15);
+    ctx.strokeStyle = "gray";
+    ctx.strokeRect(left, top, w, h);
+    ctx.beginPath();
+    ctx.moveTo(left, Y(0));
+    ctx.lineTo(left + w, Y(0));
+    ctx.stroke();
+    ctx.fillStyle = "black";
+    ctx.fillText(b.ymax.toPrecision(4), 5, top + 10);
+    ctx.fillText(b.ymin.toPrecision(4), 5, top + h);
+    ctx.fillText(b.xmin.toPrecision(3), left, top + h + 15);
+    ctx.fillText(b.xmax.toPrecision(3), left + w - 25, top + h + 15);
+
+    series.forEach(function (s) {
+      ctx.strokeStyle = s.color;
+      ctx.beginPath();
+      if (s.xs.length === 1) {
+        // point loading
+        ctx.moveTo(X(s.xs[0]), Y(0));
+        ctx.lineTo(X(s.xs[0]), Y(s.ys[0]));
+      } else {
+        // the line is broken where there is no value
+        var up = true;
+        s.xs.forEach(function (x, i) {
+          if (x === null || s.ys[i] === null) { up = true; return; }
+          if (up) { ctx.moveTo(X(x), Y(s.ys[i])); } else { ctx.lineTo(X(x), Y(s.ys[i])); }
+          up = false;
+        });
+      }
+      ctx.stroke();
+    });
+  }
+
+  fetch(url)
+    .then(function (response) { return response.json(); })
+    .then(function (data) {
+      document.querySelectorAll("canvas.chart").forEach(function (canvas) {
+        var d = canvas.dataset, series;
+        if (d.quantity) {
+          // every diagram has its own stations, twice at each jump
+          series = [{ xs: data[d.quantity].x, ys: data[d.quantity].y, color: "steelblue" }];
+        } else {
+          series = data[d.load].map(function (load) {
+            return { xs: load.xs, ys: load[d.component], color: colors[d.component] };
+          });
+        }
+        draw(canvas, data.span, series);
+      });
+    });
+})();
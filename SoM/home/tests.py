@@ -1,3 +1,499 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from unittest import mock
+
+import numpy as np
+import sympy
 from django.test import TestCase
 
-# Create your tests here.
+from home import views
+from home.Beam import QUANTITIES, Beam, BeamBatch, LoadCases
+from home.cache import ResultCache
+from loads.models import ForceModel, MomentModel
+from model.models import BeamModel, SupportModel
+
+SECTION = (10, 0.3, 0.4, 0.02, 0.02)
+
+
+def diagrams(load, engine, integration, lenght=5000, xroller=4000):
+    beam = Beam(lenght, 0.3, 0.4, 0.02, 0.02, 0, xroller,
+                engine=engine, integration=integration)
+    beam.floading('0', load, 0, lenght)
+    beam.calculate()
+    return beam.evaluate(['w', 'V', 'Mz'], np.linspace(0, lenght, 401))
+
+
+def loaded(engine, xpin=1, xroller=8):
+    beam = Beam(*SECTION, xpin, xroller, engine=engine)
+    beam.floading('0', '-1000', 2, 6)
+    beam.floading('5', '0', 4)
+    beam.floading('2', '-500*x + 3*x**2', 6, 9)
+    beam.floading('0', '-250', 9.5)
+    beam.mloading('0', '10*x', 2, 6)
+    beam.mloading('3', '0', 7, 9)
+    beam.mloading('0', '40', 3)
+    beam.calculate()
+    return beam
+
+
+class BeamTestCase(TestCase):
+    def assertClose(self, actual, expected, rtol=1e-9, msg=None):
+        scale = max(1.0, np.abs(expected).max())
+        self.assertLessEqual(np.abs(np.asarray(actual) - expected).max(), rtol * scale, msg)
+
+
+class EngineTests(BeamTestCase):
+    def test_numeric_engine_is_the_symbolic_one(self):
+        xs = np.linspace(0, 10, 501)
+        for xroller in (8, None):
+            symbolic = loaded('symbolic', xroller=xroller)
+            numeric = loaded('numeric', xroller=xroller)
+            expected = symbolic.evaluate(QUANTITIES, xs)
+            actual = numeric.evaluate(QUANTITIES, xs)
+            for q in QUANTITIES:
+                self.assertClose(actual[q], expected[q], msg=(xroller, q))
+            for k, v in symbolic.reactions().items():
+                self.assertClose(numeric.reactions()[k], float(v), msg=(xroller, k))
+
+    def test_numeric_reactions_are_floats(self):
+        beam = Beam(*SECTION, 0, 8, engine='numeric')
+        beam.floading('0', '-2', 1, 5)
+        beam.calculate()
+        for k, v in beam.reactions().items():
+            self.assertIs(type(v), float, k)
+            self.assertEqual(str(v + 0.0), str(v), k)
+
+
+class EvaluateTests(BeamTestCase):
+    def test_coefficients_of_x_vanish_left_of_their_load(self):
+        xs = np.linspace(0, 10, 201)
+        for load in ('-sqrt(x-2)', '-log(x-1)'):
+            beam = Beam(*SECTION, 0, 8)
+            beam.floading('0', load, 2, 5)
+            beam.calculate()
+            values = beam.evaluate(QUANTITIES, xs)
+            for q in QUANTITIES:
+                self.assertTrue(np.isfinite(values[q]).all(), (load, q))
+            left = xs < 2
+            self.assertClose(values['V'][left], float(beam.reactions()['Fy_pin']) + 0 * xs[left])
+            self.assertTrue(np.isfinite(beam.sample('Mz')[1]).all(), load)
+
+            quadrature = Beam(*SECTION, 0, 8, engine='numeric', integration='numeric')
+            quadrature.floading('0', load, 2, 5)
+            quadrature.calculate()
+            expected = quadrature.evaluate(['V', 'Mz'], xs)
+            for q in ('V', 'Mz'):
+                self.assertClose(values[q], expected[q], 1e-5, (load, q))
+
+
+class ResultCacheTests(TestCase):
+    def test_least_recently_used_entries_are_dropped(self):
+        cache = ResultCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual([cache.get(k) for k in 'abc'], [1, None, 3])
+
+    def test_entries_are_shared_through_the_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ResultCache(directory=directory).set('a', {'reactions': {'Fy_pin': 1.5}})
+            self.assertEqual(ResultCache(directory=directory).get('a'), {'reactions': {'Fy_pin': 1.5}})
+
+            cache = ResultCache(directory=directory, disk_size=1)
+            os.utime(cache.path('a'), (0, 0))
+            cache.set('b', 2)
+            self.assertEqual(ResultCache(directory=directory).get('a'), None)
+            self.assertEqual(ResultCache(directory=directory).get('b'), 2)
+
+    def test_keys_do_not_depend_on_dict_order(self):
+        self.assertEqual(ResultCache.key({'a': 1, 'b': [2]}), ResultCache.key({'b': [2], 'a': 1}))
+        self.assertNotEqual(ResultCache.key([1, 2]), ResultCache.key([2, 1]))
+
+
+class ViewTestCase(BeamTestCase):
+    def setUp(self):
+        BeamModel.objects.create(len=10, unit_1='m', f=0.3, ft=0.02, w=0.4, wt=0.02, unit_2='m')
+        SupportModel.objects.create(a=1, b=8)
+        ForceModel.objects.create(x='0', y='-1000', x1=2, x2=6)
+        ForceModel.objects.create(x='5', y='-300', x1=4, x2=-1)
+        MomentModel.objects.create(x='2', z='40', x1=3, x2=-1)
+        patcher = mock.patch.object(views, 'results', ResultCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class CalculatorTests(ViewTestCase):
+    def test_repeated_requests_are_served_from_the_cache(self):
+        with mock.patch.object(views, 'analyse', wraps=views.analyse) as analyse:
+            first = self.client.get('/calculate/')
+            second = self.client.get('/calculate/')
+        self.assertEqual(analyse.call_count, 1)
+        self.assertEqual(first.context['key'], second.context['key'])
+        self.assertAlmostEqual(first.context['info']['Fy_pin'] + first.context['info']['F_roller'], 4300)
+
+    def test_other_loads_are_another_analysis(self):
+        first = self.client.get('/calculate/')
+        ForceModel.objects.create(x='0', y='-50', x1=9, x2=-1)
+        second = self.client.get('/calculate/')
+        self.assertNotEqual(first.context['key'], second.context['key'])
+        self.assertAlmostEqual(second.context['info']['Fy_pin'] + second.context['info']['F_roller'], 4350)
+
+
+class IncrementalTests(BeamTestCase):
+    def test_removed_loads_leave_no_trace(self):
+        xs = np.linspace(0, 10, 101)
+        for engine in ('symbolic', 'numeric'):
+            beam = Beam(*SECTION, 1, 8, engine=engine)
+            beam.floading('0', '-1000', 2, 6)
+            beam.mloading('2', '40', 3)
+            beam.calculate()
+            beam.evaluate(QUANTITIES, xs)
+            beam.reactions()
+            beam.floading('3', '-x**2', 1, 9)
+            beam.mloading('0', '7', 5, 9)
+            beam.calculate()
+            beam.evaluate(QUANTITIES, xs)
+            beam.remove_floading(0)
+            beam.remove_mloading(1)
+            beam.calculate()
+
+            fresh = Beam(*SECTION, 1, 8, engine=engine)
+            fresh.floading('3', '-x**2', 1, 9)
+            fresh.mloading('2', '40', 3)
+            fresh.calculate()
+            actual = beam.evaluate(QUANTITIES, xs)
+            expected = fresh.evaluate(QUANTITIES, xs)
+            for q in QUANTITIES:
+                self.assertClose(actual[q], expected[q], msg=(engine, q))
+            for k, v in fresh.reactions().items():
+                self.assertClose(float(beam.reactions()[k]), float(v), msg=(engine, k))
+
+    def test_sync_only_touches_changed_loads(self):
+        loads = [['0', '-1', 1, 2], ['0', '-2', 3, None], ['1', '0', 4, 5]]
+        added, removed = [], []
+        views.sync(loads, [['1', '0', 4, 5], ['0', '-1', 1, 2], ['0', '-3', 6, None]],
+                   lambda *data: added.append(list(data)), removed.append)
+        self.assertEqual(removed, [1])
+        self.assertEqual(added, [['0', '-3', 6, None]])
+        self.assertEqual(loads, [['0', '-1', 1, 2], ['1', '0', 4, 5], ['0', '-3', 6, None]])
+
+
+class ExtremaTests(BeamTestCase):
+    def test_extrema_bound_dense_samples(self):
+        xs = np.linspace(0, 10, 20001)
+        beams = [loaded(engine, xroller=xroller) for engine in ('symbolic', 'numeric') for xroller in (8, None)]
+        # no closed form for the roots of its pieces
+        hard = Beam(*SECTION, 1, 8)
+        hard.floading('0', '-sqrt(x)', 0, 10)
+        hard.calculate()
+        for beam in beams + [hard]:
+            values = beam.evaluate(QUANTITIES, xs)
+            for q in QUANTITIES:
+                extrema = beam.extrema(q)
+                self.assertEqual(beam.extrema(q), extrema)
+                scale = max(1.0, np.abs(values[q]).max())
+                self.assertTrue(values[q].max() - 1e-9 * scale <= extrema['max'][1] <= values[q].max() + 1e-3 * scale, q)
+                self.assertTrue(values[q].min() - 1e-3 * scale <= extrema['min'][1] <= values[q].min() + 1e-9 * scale, q)
+                for x, _ in extrema.values():
+                    self.assertTrue(0 <= x <= 10, q)
+
+
+class SampleTests(BeamTestCase):
+    def test_samples_keep_jumps_and_follow_the_diagram(self):
+        for engine in ('symbolic', 'numeric'):
+            beam = loaded(engine)
+            for q in ('V', 'Mz', 'sigma'):
+                xs, ys = beam.sample(q)
+                self.assertEqual((xs[0], xs[-1]), (0, 10))
+                self.assertTrue((np.diff(xs) >= 0).all(), (engine, q))
+                # between the jumps the polyline is within tol * max |y|
+                stations = np.linspace(0, 10, 1001)
+                stations = stations[np.abs(stations[:, None] - np.array([1, 2, 4, 6, 8, 9, 9.5])).min(axis=1) > 1e-3]
+                scale = np.abs(ys).max()
+                values = beam.evaluate([q], stations)[q]
+                self.assertLessEqual(np.abs(np.interp(stations, xs, ys) - values).max(), 2e-3 * scale, (engine, q))
+            # the reaction at the roller is a vertical step
+            xs, ys = beam.sample('V')
+            i = np.flatnonzero(xs == 8)
+            self.assertEqual(len(i), 2, engine)
+            self.assertClose(ys[i[1]] - ys[i[0]], float(beam.reactions()['F_roller']), msg=engine)
+
+
+class PendingRenderTests(ViewTestCase):
+    def test_renders_nobody_asks_for_are_dropped(self):
+        with mock.patch.object(views, 'results', ResultCache(2)), \
+                mock.patch.object(views, 'pending', OrderedDict()):
+            keys = []
+            for y in ('-10', '-20', '-30'):
+                ForceModel.objects.create(x='0', y=y, x1=1, x2=-1)
+                keys.append(self.client.get('/calculate/').context['key'])
+            self.assertEqual(list(views.pending), [(keys[1], 'latex.png'), (keys[2], 'latex.png')])
+
+            response = self.client.get('/calculate/%s/latex.png' % keys[2])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertEqual(list(views.pending), [(keys[1], 'latex.png')])
+            self.assertIn('latex.png', views.results.get(keys[2])['images'])
+
+
+class ImageTests(ViewTestCase):
+    def test_missing_images_are_rebuilt_for_the_current_inputs(self):
+        key = self.client.get('/calculate/').context['key']
+        # another worker, or evicted
+        with mock.patch.object(views, 'results', ResultCache()), \
+                mock.patch.object(views, 'pending', OrderedDict()):
+            response = self.client.get('/calculate/%s/latex.png' % key)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn(key, response['ETag'])
+
+        self.assertEqual(self.client.get('/calculate/%s/V.png' % key).status_code, 404)
+        ForceModel.objects.create(x='0', y='-50', x1=9, x2=-1)
+        with mock.patch.object(views, 'results', ResultCache()), \
+                mock.patch.object(views, 'pending', OrderedDict()):
+            self.assertEqual(self.client.get('/calculate/%s/latex.png' % key).status_code, 404)
+
+    def test_keys_tell_how_loads_are_integrated(self):
+        ForceModel.objects.create(x='0', y='-sqrt(x)', x1=0, x2=10)
+        with mock.patch.object(views, 'integrable', lambda loads, timeout: [True] * len(loads)):
+            symbolic = views.inputs()[0]
+        with mock.patch.object(views, 'integrable', lambda loads, timeout: [i != '-sqrt(x)' for i in loads]):
+            quadrature = views.inputs()[0]
+            with mock.patch.object(views, 'timeout', 5.0):
+                longer = views.inputs()[0]
+        self.assertEqual(len({symbolic, quadrature, longer}), 3)
+
+
+class DataTests(ViewTestCase):
+    def test_data_of_the_page_analysis(self):
+        page = self.client.get('/calculate/')
+        key = page.context['key']
+        url = '/calculate/%s/data/' % key
+        self.assertIn(url, page.content.decode())
+        data = json.loads(self.client.get(url).content, parse_constant=self.fail)
+        self.assertEqual(data['reactions'], page.context['info'])
+        self.assertEqual(data['span'], [0, 10])
+        for q in QUANTITIES:
+            self.assertEqual(len(data[q]['x']), len(data[q]['y']), q)
+        # the roller reaction stays a vertical step in the shear chart
+        self.assertEqual(data['V']['x'].count(8), 2)
+        self.assertEqual([len(i['xs']) for i in data['forces']], [50, 1])
+
+        # still the page's analysis after the loads change
+        ForceModel.objects.create(x='0', y='-50', x1=9, x2=-1)
+        self.assertEqual(json.loads(self.client.get(url).content)['reactions'], data['reactions'])
+
+    def test_values_that_are_not_finite_are_null(self):
+        self.assertEqual(views.compact([1.23456789, float('nan'), float('inf'), -2.0]), [1.234568, None, None, -2.0])
+
+
+class SegmentsTests(BeamTestCase):
+    def test_segments_are_the_diagram(self):
+        x = sympy.symbols('x')
+        for engine in ('symbolic', 'numeric'):
+            # a load at the free end gives a last (lenght, lenght) row
+            end = Beam(*SECTION, 0, 8, engine=engine)
+            end.floading('0', '-100', 10)
+            end.calculate()
+            self.assertEqual(end.segments('V')[-1][:2], (10, 10))
+            beam = loaded(engine)
+            for beam, q in [(beam, 'V'), (beam, 'Mz'), (beam, 'sigma'), (end, 'V')]:
+                rows = beam.segments(q)
+                self.assertEqual(rows[0][0], 0)
+                self.assertEqual(rows[-1][1], 10)
+                for (_, b, p), (a, _, r) in zip(rows[:-1], rows[1:]):
+                    self.assertEqual(a, b)
+                    self.assertNotEqual(p, r)
+                for a, b, p in rows:
+                    xs = np.linspace(a, b, 7)[1:-1] if a < b else np.array([b])
+                    values = beam.evaluate([q], xs)[q]
+                    self.assertClose(sympy.lambdify(x, p)(xs) + 0 * xs, values, msg=(engine, q, a))
+
+    def test_piecewise_diagrams_match_singularity_functions(self):
+        xs = np.linspace(0.05, 9.95, 100)
+        for engine in ('symbolic', 'numeric'):
+            beam = loaded(engine)
+            piecewise = Beam(*SECTION, 1, 8, engine=engine, piecewise=True)
+            for load in ((piecewise.floading, '0', '-1000', 2, 6), (piecewise.floading, '5', '0', 4),
+                         (piecewise.floading, '2', '-500*x + 3*x**2', 6, 9),
+                         (piecewise.floading, '0', '-250', 9.5), (piecewise.mloading, '0', '10*x', 2, 6),
+                         (piecewise.mloading, '3', '0', 7, 9), (piecewise.mloading, '0', '40', 3)):
+                load[0](*load[1:])
+            piecewise.calculate()
+            self.assertIn('cases', piecewise.bending()['M'])
+            actual = piecewise.evaluate(QUANTITIES, xs)
+            expected = beam.evaluate(QUANTITIES, xs)
+            for q in QUANTITIES:
+                self.assertClose(actual[q], expected[q], msg=(engine, q))
+
+
+class SuperpositionTests(BeamTestCase):
+    def test_load_sets_match_beams(self):
+        loads = [('Fy', -100, 2, 6), ('Fx', 3, 4), ('Mz', 7, 5), ('Mx', 2, 3, 7), ('Fy', -20, 10),
+                 ('Mz', 1.5, 1, 2)]
+        for xroller in (8, None):
+            beam = Beam(*SECTION, 1, xroller)
+            superposition = beam.superposition(positions=np.arange(11), xs=np.linspace(0, 10, 101))
+            actual = superposition.evaluate(superposition.weights(loads))
+
+            expected = Beam(*SECTION, 1, xroller, engine='numeric')
+            expected.floading('0', '-100', 2, 6)
+            expected.floading('3', '0', 4)
+            expected.mloading('0', '7', 5)
+            expected.mloading('2', '0', 3, 7)
+            expected.floading('0', '-20', 10)
+            expected.mloading('0', '1.5', 1, 2)
+            expected.calculate()
+            values = expected.evaluate(QUANTITIES, superposition.stations())
+            for q in QUANTITIES:
+                self.assertClose(actual[q], values[q], msg=(xroller, q))
+            reactions = superposition.reactions(superposition.weights(loads))
+            for k, v in expected.reactions().items():
+                self.assertClose(reactions[k], v, msg=(xroller, k))
+
+    def test_uniform_moments_do_not_span_positions(self):
+        superposition = Beam(*SECTION, 1, 8).superposition(positions=np.arange(11))
+        with self.assertRaises(Exception):
+            superposition.weights([('Mz', 1.5, 1, 4)])
+
+
+class InfluenceLineTests(BeamTestCase):
+    def test_lines_match_beams(self):
+        positions = np.linspace(0, 10, 11)
+        for xroller, reactions in ((8, {'Ny1': 'Fy_pin', 'Ny2': 'F_roller'}), (None, {'Ny': 'Fy', 'MzN': 'Mz'})):
+            beam = Beam(*SECTION, 2, xroller)
+            lines = {q: beam.influence_line(q, 5.5, positions) for q in ('V', 'Mz', *reactions)}
+            for j, p in enumerate(positions):
+                unit = Beam(*SECTION, 2, xroller, engine='numeric')
+                unit.floading('0', '1', p)
+                unit.calculate()
+                values = unit.evaluate(['V', 'Mz'], [5.5])
+                for q in ('V', 'Mz'):
+                    self.assertClose(lines[q][j], values[q][0], msg=(xroller, q, p))
+                for q, k in reactions.items():
+                    self.assertClose(lines[q][j], unit.reactions()[k], msg=(xroller, q, p))
+
+
+class LoadTrainTests(BeamTestCase):
+    def test_envelopes_match_every_position(self):
+        weights, spacings, step = [-50, -120, -80], [1.2, 3.0], 0.1
+        # stations off the grid, where the shear has no jump
+        xs = np.linspace(0.05, 9.95, 34)
+        lead = step * np.arange(round((10 + sum(spacings)) / step) + 1)
+        for xroller in (8, None):
+            envelopes = Beam(*SECTION, 2, xroller).load_train(weights, spacings, step, xs)
+            batch = BeamBatch(*SECTION, np.full(len(lead), 2.0), xroller)
+            for w, offset in zip(weights, np.concatenate([[0], np.cumsum(spacings)])):
+                p = np.round(lead - offset, 9)
+                batch.floading(0, np.where((p >= 0) & (p <= 10), w, 0.0), np.clip(p, 0, 10))
+            batch.calculate()
+            values = batch.evaluate(['V', 'Mz'], xs)
+            for q in ('V', 'Mz'):
+                self.assertClose(envelopes[q]['max'], values[q].max(axis=0), msg=(xroller, q))
+                self.assertClose(envelopes[q]['min'], values[q].min(axis=0), msg=(xroller, q))
+
+
+class LoadCasesTests(BeamTestCase):
+    def test_combinations_match_factored_beams(self):
+        for engine in ('symbolic', 'numeric'):
+            cases = LoadCases(*SECTION, 0, 8, engine)
+            cases.case('dead').floading('0', '-5', 0, 10)
+            cases.case('live').floading('0', '-20', 3)
+            cases.case('live').mloading('2', '0', 4, 6)
+            cases.case('wind').floading('3', '-x', 2, 9)
+            cases.combination('ULS', {'dead': 1.2, 'live': 1.6, 'wind': 0.5})
+            cases.combination('SLS', {'dead': 1, 'live': 1})
+            cases.calculate()
+            values = cases.evaluate(QUANTITIES)
+
+            factored = Beam(*SECTION, 0, 8, engine=engine)
+            factored.floading('0', '-6', 0, 10)
+            factored.floading('0', '-32', 3)
+            factored.mloading('3.2', '0', 4, 6)
+            factored.floading('1.5', '-0.5*x', 2, 9)
+            factored.calculate()
+            expected = factored.evaluate(QUANTITIES, np.linspace(0, 10, 100))
+            for q in QUANTITIES:
+                self.assertClose(values[q][0], expected[q], msg=(engine, q))
+            for k, v in factored.reactions().items():
+                self.assertClose(cases.reactions()[k][0], float(v), msg=(engine, k))
+            envelopes = cases.envelopes(['Mz'])
+            self.assertClose(envelopes['Mz']['max'], values['Mz'].max(axis=0))
+
+
+class ArrayLoadTests(BeamTestCase):
+    def test_arrays_match_floading(self):
+        positions = np.array([0.5, 2.25, 2.25, 7.0, 10.0])
+        fx = np.array([1.0, -2.0, 0.5, 0.0, 3.0])
+        fy = np.array([-3.0, 1.5, -4.0, 2.0, -1.0])
+        xs = np.array([1.0, 2.5, 4.0, 6.5])
+        q = np.array([-2.0, 1.0, 3.0, -1.0])
+        stations = np.linspace(0, 10, 301)
+        for engine in ('symbolic', 'numeric'):
+            for xroller in (7, None):
+                arrays = Beam(*SECTION, 1, xroller, engine=engine)
+                arrays.add_point_loads(positions, fx, fy)
+                arrays.add_tabulated_load(xs, q)
+                arrays.calculate()
+
+                loads = Beam(*SECTION, 1, xroller, engine=engine)
+                for p, x, y in zip(positions, fx, fy):
+                    loads.floading(str(x), str(y), p)
+                for x1, x2, q1, q2 in zip(xs[:-1], xs[1:], q[:-1], q[1:]):
+                    m = (q2 - q1) / (x2 - x1)
+                    loads.floading('0', '%r + %r*x' % (float(q1 - m * x1), float(m)), x1, x2)
+                loads.calculate()
+
+                actual = arrays.evaluate(QUANTITIES, stations)
+                expected = loads.evaluate(QUANTITIES, stations)
+                for k in QUANTITIES:
+                    self.assertClose(actual[k], expected[k], 1e-8, (engine, xroller, k))
+                for k, v in loads.reactions().items():
+                    self.assertClose(float(arrays.reactions()[k]), float(v), msg=(engine, xroller, k))
+
+    def test_many_loads_on_the_default_engine(self):
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(0, 10, 10000)
+        fx = rng.uniform(-1, 1, 10000)
+        fy = rng.uniform(-1, 1, 10000)
+        stations = np.linspace(0, 10, 501)
+        beams = {}
+        for engine in ('symbolic', 'numeric'):
+            beams[engine] = Beam(*SECTION, 1, 8, engine=engine)
+            beams[engine].add_point_loads(positions, fx, fy)
+            beams[engine].floading('0', 'x**2', 2, 5)
+            beams[engine].calculate()
+        actual = beams['symbolic'].evaluate(QUANTITIES, stations)
+        expected = beams['numeric'].evaluate(QUANTITIES, stations)
+        for k in QUANTITIES:
+            self.assertClose(actual[k], expected[k], 1e-10, k)
+        for k in ('max', 'min'):
+            actual = beams['symbolic'].extrema('Mz')[k][1]
+            self.assertClose(actual, beams['numeric'].extrema('Mz')[k][1], 1e-10, k)
+
+    def test_latex_writes_the_loads_out(self):
+        beam = Beam(*SECTION, 1, 8)
+        beam.add_point_loads([2, 3], 0, [1, 2])
+        beam.calculate()
+        self.assertIn(r'\left\langle x - 3 \right\rangle', beam.bending()['V'])
+
+
+class QuadratureTests(BeamTestCase):
+    def test_engines_agree_on_a_long_span(self):
+        for load in ('-sqrt(x)', '-(1+sin(x/500))*log(x+1)/(1+x**2/1e7)'):
+            symbolic = diagrams(load, 'symbolic', 'numeric')
+            numeric = diagrams(load, 'numeric', 'numeric')
+            for q in ('w', 'V', 'Mz'):
+                scale = np.abs(numeric[q]).max()
+                self.assertLess(np.abs(symbolic[q] - numeric[q]).max(), 1e-5 * scale, (load, q))
+
+    def test_quadrature_is_close_to_sympy(self):
+        exact = diagrams('-sqrt(x)', 'symbolic', 'symbolic')
+        numeric = diagrams('-sqrt(x)', 'numeric', 'numeric')
+        for q in ('V', 'Mz'):
+            scale = np.abs(exact[q]).max()
+            self.assertLess(np.abs(numeric[q] - exact[q]).max(), 1e-4 * scale, q)
@@ -8,4 +8,6 @@ urlpatterns = [
     path('forces/', forces_button, name='forces'),
     path('moments/', moments_button, name='moments'),
     path('calculate/', calculator, name='results'),
-]
\ No newline at end of file
+    path('calculate/<str:key>/data/', data, name='data'),
+    path('calculate/<str:key>/<str:name>', image, name='image'),
+]
\ No newline at end of file
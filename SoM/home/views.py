@@ -1,9 +1,30 @@
+import math
+import threading
+from collections import OrderedDict
+from django.conf import settings
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
-from .Beam import Beam
+from django.http import HttpResponse, Http404, JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
+from .Beam import Beam, QUANTITIES, integrable
+from .cache import ResultCache
+from .render import latex_png, submit
 from model import models as mModels
 from loads import models as lModels
-from .mtpltlb import tex_plot
+
+
+results = ResultCache(getattr(settings, 'BEAM_CACHE_SIZE', 128),
+                      getattr(settings, 'BEAM_CACHE_DIR', None))
+
+# the last solved beam, loads are added to and removed from it between requests
+last = {'Bdata': None, 'beam': None, 'forces': [], 'moments': []}
+lock = threading.Lock()
+# renders of the result images that are not done yet, by key and name, the oldest
+# are dropped past BEAM_CACHE_SIZE and image() renders them again if asked for
+pending = OrderedDict()
+pending_lock = threading.Lock()
+# seconds sympy gets to integrate a load, see Beam(..., integration='auto')
+timeout = getattr(settings, 'BEAM_INTEGRATION_TIMEOUT', 2.0)
 
 
 def homepage(request):
@@ -30,52 +51,69 @@ def moments_button(request):
     return render(request, 'loads/Moment.html')
 
 
-def calculator(request):
-    beam = mModels.BeamModel.objects.last()
-    support = mModels.SupportModel.objects.last()
-    forces = lModels.ForceModel.objects.all()
-    moments = lModels.MomentModel.objects.all()
+def sync(loads, new, add, remove):
+    # keep the loads that are still there, remove the others and add the new ones
+    kept = list(new)
+    for i in reversed(range(len(loads))):
+        if loads[i] in kept:
+            kept.remove(loads[i])
+        else:
+            remove(i)
+            loads.pop(i)
+    for data in kept:
+        add(data[0], data[1], data[2], data[3])
+        loads.append(data)
 
-    Bdata = [
-        beam.len,
-        beam.f,
-        beam.w,
-        beam.ft,
-        beam.wt,
-        support.a,
-        support.b
-    ]
-    if support.b < 0:
-        Bdata[6] = None
 
-    instance = Beam(Bdata[0], Bdata[1], Bdata[2],
-                    Bdata[3], Bdata[4], Bdata[5], Bdata[6])
+def solve(key, Bdata, Fdatas, Mdatas, sheet):
+    with lock:
+        result, renders = analyse(Bdata, Fdatas, Mdatas, sheet)
+    result['images'] = {}
+    results.set(key, result)
+    # the page only needs the reactions, the images are kept as they are done
+    with pending_lock:
+        for name, job in renders.items():
+            pending[key, name] = job
+            pending.move_to_end((key, name))
+        while len(pending) > results.size:
+            pending.popitem(last=False)
+    for name, job in renders.items():
+        job.add_done_callback(lambda job, name=name: finish(key, result, name, job))
+    return result
 
-    for force in forces:
-        Fdata = [force.x, force.y, force.x1, force.x2]
-        if force.x2 < 0:
-            Fdata[3] = None
-        instance.floading(Fdata[0], Fdata[1], Fdata[2], Fdata[3])
 
-    for moment in moments:
-        Mdata = [moment.x, moment.z, moment.x1, moment.x2]
-        if moment.x2 < 0:
-            Mdata[3] = None
-        instance.mloading(Mdata[0], Mdata[1], Mdata[2], Mdata[3])
+def finish(key, result, name, job):
+    if job.exception() is None:
+        result['images'][name] = job.result()
+        results.set(key, result)
+    with pending_lock:
+        if pending.get((key, name)) is job:
+            del pending[key, name]
+
+
+def analyse(Bdata, Fdatas, Mdatas, sheet):
+    if last['Bdata'] != Bdata:
+        last['Bdata'] = list(Bdata)
+        last['beam'] = Beam(Bdata[0], Bdata[1], Bdata[2],
+                            Bdata[3], Bdata[4], Bdata[5], Bdata[6],
+                            integration='auto', timeout=timeout)
+        last['forces'] = []
+        last['moments'] = []
+    instance = last['beam']
+
+    sync(last['forces'], Fdatas, instance.floading, instance.remove_floading)
+    sync(last['moments'], Mdatas, instance.mloading, instance.remove_mloading)
 
     instance.calculate()
-    reactions = instance.reactions()
-    loads = instance.loadings()
-    
-    base = "/var/www/html/static/home/"
-    loads[0].savefig(base + 'loads1.png')
-    loads[1].savefig(base + 'loads2.png')
-    instance.bending_plot().savefig(base + 'plt.png')
-    instance.normal_stress_max_plot().savefig(base + 'sigma.png')
-    instance.tau_y_max_plot().savefig(base + 'tau_y.png')
-    instance.tau_xy_max_plot().savefig(base + 'tau_xy.png')
-    instance.torque_plot().savefig(base + 'torque.png')
-    
+    reactions = {k: float(v) for k, v in instance.reactions().items()}
+    # sampled around the breakpoints, so the charts keep the jumps of point loads
+    diagrams = {q: instance.sample(q) for q in QUANTITIES}
+    result = {'reactions': reactions, 'span': [0.0, float(Bdata[0])],
+              'diagrams': diagrams, 'loads': instance.load_values()}
+    # the charts are drawn by the browser, only the latex sheet is an image
+    if not sheet:
+        return result, {}
+
     latex = instance.bending()
     BG = instance.beam_geom()
 
@@ -83,6 +121,7 @@ def calculator(request):
     latex['tau_y_max']=instance.tau_y_max()
     latex['tau_xy_max']=instance.tau_xy_max()
     latex['torque']=instance.torque()
+    latex.update(BG)
 
     a = latex['w']
     b = latex['V']
@@ -115,5 +154,108 @@ def calculator(request):
     Iyy = formatter(j)
     Izz = formatter(k)
 
-    latex_plotter = tex_plot(w, v, m, sigma_max, tau_y_max, tau_xy_max, torque, ybar, ymax, Iyy, Izz)
-    return render(request, 'home/proj2.html', {'result': 1, 'info': reactions})
+    result['latex'] = latex
+    return result, {
+        'latex.png': submit(latex_png, w, v, m, sigma_max, tau_y_max, tau_xy_max, torque, ybar, ymax, Iyy, Izz),
+    }
+
+
+def inputs():
+    beam = mModels.BeamModel.objects.last()
+    support = mModels.SupportModel.objects.last()
+    forces = lModels.ForceModel.objects.all()
+    moments = lModels.MomentModel.objects.all()
+
+    Bdata = [
+        beam.len,
+        beam.f,
+        beam.w,
+        beam.ft,
+        beam.wt,
+        support.a,
+        support.b
+    ]
+    if support.b < 0:
+        Bdata[6] = None
+
+    Fdatas = []
+    for force in forces:
+        Fdata = [force.x.strip(), force.y.strip(), force.x1, force.x2]
+        if force.x2 < 0:
+            Fdata[3] = None
+        Fdatas.append(Fdata)
+
+    Mdatas = []
+    for moment in moments:
+        Mdata = [moment.x.strip(), moment.z.strip(), moment.x1, moment.x2]
+        if moment.x2 < 0:
+            Mdata[3] = None
+        Mdatas.append(Mdata)
+
+    # the loads sympy can not integrate in time are found before the lock, all at
+    # once, and hashed with the rest so a key always stands for the same sheet
+    loads = [i for Fdata in Fdatas for i in Fdata[:2]]
+    quadrature = sorted({i for i, found in zip(loads, integrable(loads, timeout)) if not found})
+
+    # loads are summed, their order does not change the analysis
+    key = ResultCache.key(Bdata, sorted(Fdatas, key=str), sorted(Mdatas, key=str),
+                          'auto', timeout, quadrature)
+    return key, Bdata, Fdatas, Mdatas
+
+
+def calculator(request):
+    key, Bdata, Fdatas, Mdatas = inputs()
+    result = results.get(key)
+    if result is None or ('latex.png' not in result['images'] and (key, 'latex.png') not in pending):
+        result = solve(key, Bdata, Fdatas, Mdatas, True)
+
+    return render(request, 'home/proj2.html', {'result': 1, 'info': result['reactions'], 'key': key})
+
+
+def compact(values):
+    # float32 precision is plenty for a chart and keeps the json short, json has no
+    # nan or inf
+    return [float('%.7g' % v) if math.isfinite(v) else None for v in values]
+
+
+def resolve(key, sheet):
+    # solved by another worker or evicted, the inputs still hash to key if unchanged
+    current, Bdata, Fdatas, Mdatas = inputs()
+    if current != key:
+        raise Http404('no such analysis')
+    return solve(key, Bdata, Fdatas, Mdatas, sheet)
+
+
+def data(request, key):
+    # the analysis of the page, even if the loads changed since
+    result = results.get(key)
+    if result is None:
+        result = resolve(key, False)
+
+    loads = {
+        kind: [{k: compact(v) if k in ('xs', 'x', 'y', 'z') else v for k, v in load.items()}
+               for load in result['loads'][kind]]
+        for kind in ('forces', 'moments')
+    }
+    diagrams = {name: {'x': compact(xs), 'y': compact(ys)}
+                for name, (xs, ys) in result['diagrams'].items()}
+    return JsonResponse({'key': key, 'reactions': result['reactions'], 'span': result['span'],
+                         **diagrams, **loads})
+
+
+# the key hashes the analysis, so the image behind a url never changes
+@cache_control(public=True, max_age=31536000, immutable=True)
+@etag(lambda request, key, name: key + '-' + name)
+def image(request, key, name):
+    result = results.get(key)
+    if (key, name) not in pending and (result is None or name not in result['images']):
+        if name != 'latex.png':
+            raise Http404('no such image')
+        resolve(key, True)
+    job = pending.get((key, name))
+    if job is not None:
+        return HttpResponse(job.result(), content_type='image/png')
+    result = results.get(key)
+    if result is None or name not in result['images']:
+        raise Http404('no such image')
+    return HttpResponse(result['images'][name], content_type='image/png')